@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { motion } from 'framer-motion';
 import { Send, Video, LogOut, Sparkles, History, Plus, User } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
@@ -42,6 +42,8 @@ interface ChatHistoryItem {
   lastMessage: string;
   updatedAt: string;
   messageCount: number;
+  isArchived: boolean;
+  // null for archived chats until they are opened
   chat_history: Array<{
     query: string;
     response: {
@@ -54,7 +56,7 @@ interface ChatHistoryItem {
       }>;
       timestamps: Array<{ time: string; description: string }>;
     };
-  }>;
+  }> | null;
 }
 
 export default function ChatInterface({ setIsAuthenticated }: ChatInterfaceProps) {
@@ -69,18 +71,32 @@ export default function ChatInterface({ setIsAuthenticated }: ChatInterfaceProps
   const [error, setError] = useState('');
   const [currentChatId, setCurrentChatId] = useState<number | undefined>(undefined);
   const [currentVideoUrl, setCurrentVideoUrl] = useState<string>('');
-  const [hasHistory, setHasHistory] = useState(false);
   const [chatHistory, setChatHistory] = useState<ChatHistoryItem[]>([]);
   const [showHistory, setShowHistory] = useState(false);
+  const syncTokenRef = useRef<string | undefined>(undefined);
+  const hasHistory = chatHistory.length > 0;
 
-  useEffect(() => {
-    videoAPI.getChatHistory()
+  // Fetch only chats changed since the last sync and merge them into the list
+  const syncChatHistory = () => {
+    videoAPI.getChatHistory(syncTokenRef.current)
       .then(response => {
-        const chats = response.data.chats || [];
-        setChatHistory(chats);
-        setHasHistory(chats.length > 0);
+        const chats: ChatHistoryItem[] = response.data.chats || [];
+        const deleted: number[] = response.data.deleted || [];
+        syncTokenRef.current = response.data.syncToken;
+        const changedIds = new Set(chats.map(chat => chat.id));
+        // Changed chats are the most recently updated, so they go on top
+        setChatHistory(prev => [
+          ...chats,
+          ...prev.filter(chat => !changedIds.has(chat.id) && !deleted.includes(chat.id))
+        ]);
       })
       .catch(() => {});
+  };
+
+  useEffect(() => {
+    syncChatHistory();
+    // Initial sync only; later syncs are triggered by chat actions
+    // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
   const handleSubmit = (e: React.FormEvent) => {
@@ -144,14 +160,8 @@ export default function ChatInterface({ setIsAuthenticated }: ChatInterfaceProps
         setMessages(prev => [...prev, aiMessage]);
         setSelectedMessage(aiMessage);
         setIsProcessing(false);
-        setHasHistory(true);
         // Refresh chat history
-        videoAPI.getChatHistory()
-          .then(response => {
-            const chats = response.data.chats || [];
-            setChatHistory(chats);
-          })
-          .catch(() => {});
+        syncChatHistory();
       })
       .catch(err => {
         setIsProcessing(false);
@@ -184,13 +194,7 @@ export default function ChatInterface({ setIsAuthenticated }: ChatInterfaceProps
     setError('');
     setShowHistory(false);
     // Refresh chat history when starting new chat
-    videoAPI.getChatHistory()
-      .then(response => {
-        const chats = response.data.chats || [];
-        setChatHistory(chats);
-        setHasHistory(chats.length > 0);
-      })
-      .catch(() => {});
+    syncChatHistory();
   };
 
   const loadPreviousChat = (chat: ChatHistoryItem) => {
@@ -198,6 +202,17 @@ export default function ChatInterface({ setIsAuthenticated }: ChatInterfaceProps
     setCurrentVideoUrl(chat.videoUrl);
     setVideoUrl(chat.videoUrl);
     setShowHistory(false);
+    if (chat.chat_history) {
+      showChatMessages(chat);
+      return;
+    }
+    // Archived chats are listed without their messages; fetch them when opened
+    videoAPI.getChat(chat.id)
+      .then(response => showChatMessages(response.data))
+      .catch(() => setError('Could not load this chat. Please try again.'));
+  };
+
+  const showChatMessages = (chat: ChatHistoryItem) => {
     // Load chat messages from history
     const loadedMessages: Message[] = [];
     chat.chat_history?.forEach((item, index) => {
@@ -58,9 +58,18 @@ export const videoAPI = {
       headers: { 'X-CSRFToken': token || '' }
     });
   },
-  getChatHistory: () => {
+  // Pass the syncToken from the previous response to fetch only chats changed since then
+  getChatHistory: (since?: string) => {
     const token = getCsrfToken();
     return axios.get(`${API_BASE_URL}/videos/history/`, {
+      params: since ? { since } : {},
+      headers: { 'X-CSRFToken': token || '' }
+    });
+  },
+  // Full messages of one chat; the history list leaves them out for archived chats
+  getChat: (chatId: number) => {
+    const token = getCsrfToken();
+    return axios.get(`${API_BASE_URL}/videos/history/${chatId}/`, {
       headers: { 'X-CSRFToken': token || '' }
     });
   }
@@ -0,0 +1,81 @@
+import gzip
+
+import brotli
+from django.conf import settings
+from django.http import HttpResponse
+from django.middleware.gzip import GZipMiddleware
+from django.test import RequestFactory
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress responses with Brotli when the client accepts it, otherwise with gzip.
+    Bodies smaller than COMPRESSION_MIN_SIZE are sent as-is since the framing
+    overhead outweighs the savings. Streaming responses are left to gzip, and media
+    responses are sent as-is.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        # Media is already compressed, and byte ranges must reach the client untouched
+        if response.has_header("Content-Range") or response.get("Content-Type", "").startswith(("video/", "audio/")):
+            return response
+
+        ae = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if response.streaming or response.has_header("Content-Encoding") or not re_accepts_brotli.search(ae):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        # Return the compressed content only if it's actually shorter
+        compressed_content = brotli.compress(response.content, quality=settings.BROTLI_QUALITY)
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers["Content-Length"] = str(len(response.content))
+
+        # A compressed representation can only carry a weak ETag (RFC 9110 Section 8.8.1)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+
+        return response
+
+
+####    TESTS    ####
+
+
+def _compress(accept_encoding, content=b'{"chats": []}' * 200, **headers):
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+    response = HttpResponse(content, content_type='application/json', headers=headers)
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+def test_brotli_is_preferred_over_gzip_and_small_bodies_are_sent_as_is(settings):
+    content = b'{"chats": []}' * 200
+    settings.COMPRESSION_MIN_SIZE = 1024
+
+    response = _compress('gzip, deflate, br')
+    assert response['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.content) == content
+
+    response = _compress('gzip, deflate')
+    assert response['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.content) == content
+
+    response = _compress('gzip, deflate, br', content=content[:1000])
+    assert not response.has_header('Content-Encoding')
+    assert response.content == content[:1000]
+
+
+def test_compressed_responses_carry_weak_etags():
+    assert _compress('br', ETag='"abc"')['ETag'] == 'W/"abc"'
+    assert _compress('gzip', ETag='"abc"')['ETag'] == 'W/"abc"'
+    assert _compress('identity', ETag='"abc"')['ETag'] == '"abc"'
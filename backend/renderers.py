@@ -0,0 +1,36 @@
+import datetime as dt
+from decimal import Decimal
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from django.utils.translation import gettext_lazy
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer backed by orjson. Types orjson does not know natively
+    (lazy strings, Decimal, ...) fall back to DRF's own encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=JSONEncoder().default, option=orjson.OPT_UTC_Z)
+
+
+####    TESTS    ####
+
+
+def test_orjson_renderer_matches_drf_json_renderer():
+    data = {
+        'text': 'Vidéo ✓',
+        'when': dt.datetime(2026, 10, 19, 12, 30, 5, 123456, tzinfo=dt.timezone.utc),
+        'amount': Decimal('1.5'),
+        'label': gettext_lazy('Video'),
+        'nested': [{'id': 1, 'ok': True, 'missing': None}],
+    }
+
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert ORJSONRenderer().render(None) == JSONRenderer().render(None) == b''
@@ -58,6 +58,7 @@ INSTALLED_APPS = BASE_APPS + THIRD_PARTY_APPS + CUSTOM_APPS
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'backend.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -134,6 +135,40 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Downloaded videos live in the 'videos' storage (videos.storage). VIDEO_STORAGE_BACKEND=local keeps
+# them under MEDIA_ROOT; s3 uses any S3-compatible service (set VIDEO_STORAGE_ENDPOINT_URL for MinIO
+# or another local stand-in). Workers keep a read-through copy of remote files in VIDEO_CACHE_ROOT.
+VIDEO_STORAGE_BACKEND = env('VIDEO_STORAGE_BACKEND', default='local')
+VIDEO_STORAGE_CHUNK_SIZE = env.int('VIDEO_STORAGE_CHUNK_SIZE', default=8 * 1024 * 1024)
+VIDEO_CACHE_ROOT = env('VIDEO_CACHE_ROOT', default=str(BASE_DIR / 'media_cache'))
+VIDEO_CACHE_MAX_BYTES = env.int('VIDEO_CACHE_MAX_BYTES', default=20 * 1024 ** 3)
+
+VIDEO_STORAGE_BACKENDS = {
+    'local': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        'OPTIONS': {'location': MEDIA_ROOT, 'base_url': MEDIA_URL},
+    },
+    's3': {
+        'BACKEND': 'storages.backends.s3.S3Storage',
+        'OPTIONS': {
+            'bucket_name': env('VIDEO_STORAGE_BUCKET', default='guide-ai-videos'),
+            'endpoint_url': env('VIDEO_STORAGE_ENDPOINT_URL', default=None),
+            'region_name': env('VIDEO_STORAGE_REGION', default=None),
+            'access_key': env('VIDEO_STORAGE_ACCESS_KEY', default=None),
+            'secret_key': env('VIDEO_STORAGE_SECRET_KEY', default=None),
+            'file_overwrite': False,
+            # Spill reads to disk past one chunk instead of holding whole videos in memory
+            'max_memory_size': VIDEO_STORAGE_CHUNK_SIZE,
+        },
+    },
+}
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'videos': VIDEO_STORAGE_BACKENDS[VIDEO_STORAGE_BACKEND],
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -168,6 +203,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        env('JSON_RENDERER', default='backend.renderers.ORJSONRenderer'),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Token bucket rates (burst size / refill period) for users.throttles.TokenBucketThrottle scopes
+    'DEFAULT_THROTTLE_RATES': {
+        'video_process': env('THROTTLE_VIDEO_PROCESS', default='10/min'),
+        'video_history': env('THROTTLE_VIDEO_HISTORY', default='60/min'),
+        'password_change': env('THROTTLE_PASSWORD_CHANGE', default='3/hour'),
+    },
 }
 
 # Allow cookies to work cross-origin for development
@@ -179,9 +224,77 @@ CSRF_COOKIE_HTTPONLY = False  # Allow JavaScript to read CSRF cookie
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'no-reply@guideai.com'
 
-# Cache configuration (using local memory for development)
+# Admin changelists switch to PostgreSQL row estimates above this many rows (videos.admin.EstimatedCountPaginator)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = env.int('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000)
+
+# Response compression (backend.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = env.int('COMPRESSION_MIN_SIZE', default=1024)
+BROTLI_QUALITY = env.int('BROTLI_QUALITY', default=5)
+
+# Cache configuration (local memory for development; set CACHE_URL=redis://... so rate limits
+# and ingestion counters are shared across workers)
 CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
+    'default': env.cache('CACHE_URL', default='locmemcache://')
 }
+
+# Chat history syncTokens lag the server clock by this many seconds, so chats committed
+# shortly after a sync are re-sent rather than missed (videos.views.get_chat_history)
+CHAT_SYNC_TOKEN_MARGIN = env.int('CHAT_SYNC_TOKEN_MARGIN', default=30)
+
+# Video ingestion admission control (see videos.throttles.ingest_slot)
+VIDEO_INGEST_MAX_PER_USER = env.int('VIDEO_INGEST_MAX_PER_USER', default=2)
+VIDEO_INGEST_BACKLOG_LIMIT = env.int('VIDEO_INGEST_BACKLOG_LIMIT', default=20)
+VIDEO_INGEST_RETRY_AFTER = env.int('VIDEO_INGEST_RETRY_AFTER', default=30)
+VIDEO_INGEST_SLOT_TIMEOUT = env.int('VIDEO_INGEST_SLOT_TIMEOUT', default=3600)
+
+# Size of the LRU cache of recent URL canonicalizations (videos.links.canonicalize)
+VIDEO_URL_CACHE_SIZE = env.int('VIDEO_URL_CACHE_SIZE', default=4096)
+# How long yt-dlp metadata is cached per canonical video id (videos.pipeline.register_video)
+VIDEO_METADATA_CACHE_TIMEOUT = env.int('VIDEO_METADATA_CACHE_TIMEOUT', default=3600)
+
+# Where video metadata and media come from (videos.providers). Set VIDEO_MEDIA_PROVIDER to
+# videos.providers.SyntheticProvider to serve generated videos offline (load tests, see
+# `manage.py loadtest_ingest`); VIDEO_SYNTHETIC_* shape those videos and inject latency/failures.
+VIDEO_MEDIA_PROVIDER = env('VIDEO_MEDIA_PROVIDER', default='videos.providers.YtDlpProvider')
+VIDEO_SYNTHETIC_OPTIONS = {
+    'duration': env.int('VIDEO_SYNTHETIC_DURATION', default=60),
+    'width': env.int('VIDEO_SYNTHETIC_WIDTH', default=1280),
+    'height': env.int('VIDEO_SYNTHETIC_HEIGHT', default=720),
+    'bitrate_kbps': env.int('VIDEO_SYNTHETIC_BITRATE_KBPS', default=1000),
+    'latency': env.float('VIDEO_SYNTHETIC_LATENCY', default=0.0),
+    'failure_rate': env.float('VIDEO_SYNTHETIC_FAILURE_RATE', default=0.0),
+    'throughput': env.int('VIDEO_SYNTHETIC_THROUGHPUT', default=0),
+    'media_dir': env('VIDEO_SYNTHETIC_MEDIA_DIR', default=''),
+}
+
+# Bulk video import (videos.importer)
+VIDEO_IMPORT_MAX_WORKERS = env.int('VIDEO_IMPORT_MAX_WORKERS', default=4)
+VIDEO_IMPORT_MAX_ITEMS = env.int('VIDEO_IMPORT_MAX_ITEMS', default=500)
+VIDEO_IMPORT_BATCH_SIZE = env.int('VIDEO_IMPORT_BATCH_SIZE', default=200)
+# URLs are expanded inside the import request, so it takes at most this many (playlists count as one)
+VIDEO_IMPORT_MAX_REQUEST_URLS = env.int('VIDEO_IMPORT_MAX_REQUEST_URLS', default=10)
+# Downloads still pending/downloading this many seconds after being queued were lost to a
+# worker restart; `manage.py recover_downloads` (run on deploy or from cron) retries or fails them
+VIDEO_DOWNLOAD_STALE_AFTER = env.int('VIDEO_DOWNLOAD_STALE_AFTER', default=6 * 3600)
+
+# Bulk user provisioning and export (users.provisioning). Password hashing runs in
+# USER_PROVISION_HASH_WORKERS processes; set it to the number of CPU cores.
+USER_PROVISION_BATCH_SIZE = env.int('USER_PROVISION_BATCH_SIZE', default=1000)
+USER_PROVISION_HASH_WORKERS = env.int('USER_PROVISION_HASH_WORKERS', default=4)
+USER_PROVISION_MAX_REPORTED_ERRORS = env.int('USER_PROVISION_MAX_REPORTED_ERRORS', default=100)
+# Rows accepted per upload to the provisioning API, whose passwords are hashed in the request
+# (about 0.5 s each); `manage.py provision_users` has no limit
+USER_PROVISION_MAX_REQUEST_ROWS = env.int('USER_PROVISION_MAX_REQUEST_ROWS', default=20)
+USER_EXPORT_CHUNK_SIZE = env.int('USER_EXPORT_CHUNK_SIZE', default=2000)
+
+# Chats untouched for CHAT_ARCHIVE_AFTER_DAYS are compressed out of the hot table by
+# `manage.py archive_chats` (videos.archive). CHAT_ARCHIVE_CODEC is zstd or gzip.
+CHAT_ARCHIVE_AFTER_DAYS = env.int('CHAT_ARCHIVE_AFTER_DAYS', default=90)
+CHAT_ARCHIVE_BATCH_SIZE = env.int('CHAT_ARCHIVE_BATCH_SIZE', default=500)
+CHAT_ARCHIVE_CODEC = env('CHAT_ARCHIVE_CODEC', default='zstd')
+
+# Heavy dependencies (yt-dlp, the S3 client) are imported on first use to keep cold starts fast.
+# Long-lived workers can set PRELOAD_HEAVY_DEPENDENCIES=True to load them at startup instead
+# (videos.warmup), together with any extra modules listed in PRELOAD_MODULES.
+PRELOAD_HEAVY_DEPENDENCIES = env.bool('PRELOAD_HEAVY_DEPENDENCIES', default=False)
+PRELOAD_MODULES = env.list('PRELOAD_MODULES', default=[])
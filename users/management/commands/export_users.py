@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from users.provisioning import export_users
+
+
+class Command(BaseCommand):
+    help = 'Stream all users with their video and chat counts as CSV or JSON Lines.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv')
+        parser.add_argument('--output', help='File to write (default: stdout)')
+
+    def handle(self, *args, **options):
+        if not options['output']:
+            for line in export_users(options['format']):
+                self.stdout.write(line, ending='')
+            return
+
+        with open(options['output'], 'w', newline='') as output:
+            output.writelines(export_users(options['format']))
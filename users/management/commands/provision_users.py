@@ -0,0 +1,35 @@
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.provisioning import detect_format, provision_users, read_records
+
+
+class Command(BaseCommand):
+    help = 'Create users in bulk from a CSV or JSON Lines file (email, password, first_name, last_name, phone_number), skipping existing emails.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='CSV (with header row) or .jsonl file, or - for stdin')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Input format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=settings.USER_PROVISION_BATCH_SIZE, help='Records validated and inserted per batch')
+        parser.add_argument('--workers', type=int, default=settings.USER_PROVISION_HASH_WORKERS, help='Password hashing processes')
+
+    def _provision(self, stream, file_format, options):
+        created = duplicates = errors = 0
+        for result in provision_users(read_records(stream, file_format), options['batch_size'], options['workers']):
+            created += result['created']
+            duplicates += result['duplicates']
+            errors += len(result['errors'])
+            for error in result['errors']:
+                self.stderr.write(f"Line {error['line']}: {error['errors']}")
+            self.stdout.write(f'Created {created:,}, skipped {duplicates:,} existing, {errors:,} invalid')
+        self.stdout.write(self.style.SUCCESS(f'Created {created:,} users'))
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or detect_format(options['file'])
+        if options['file'] == '-':
+            self._provision(sys.stdin, file_format, options)
+        else:
+            with open(options['file'], encoding='utf-8-sig', newline='') as stream:
+                self._provision(stream, file_format, options)
@@ -0,0 +1,176 @@
+import csv
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+
+import django
+import orjson
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from users.models import User
+from videos.models import Video, VideoChat
+
+PROVISION_FIELDS = ['email', 'first_name', 'last_name', 'phone_number']
+EXPORT_FIELDS = ['id', 'email', 'first_name', 'last_name', 'phone_number', 'is_active', 'date_joined', 'video_count', 'chat_count']
+
+
+def detect_format(filename):
+    return 'jsonl' if filename.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def read_records(stream, file_format):
+    """
+    Yield (line_number, record) pairs from a text stream of CSV (with a header row) or JSON
+    Lines, reading one line at a time. Unparseable JSON lines yield a None record.
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, orjson.loads(line)
+        except orjson.JSONDecodeError:
+            yield line_number, None
+
+
+def _build_user(record):
+    """An unsaved, validated User for a record, or the field errors. Uniqueness is checked per batch."""
+    if not isinstance(record, dict):
+        return None, {'record': ['Not a valid CSV row or JSON object']}
+
+    fields = {field: str(record.get(field) or '').strip() for field in PROVISION_FIELDS}
+    fields['email'] = User.objects.normalize_email(fields['email'])
+    user = User(**fields)
+    try:
+        user.full_clean(exclude=['password'], validate_unique=False)
+    except ValidationError as error:
+        return None, error.message_dict
+    return user, None
+
+
+def _provision_batch(rows, hash_passwords):
+    users = {}
+    passwords = {}
+    errors = []
+    for line_number, record in rows:
+        user, field_errors = _build_user(record)
+        if field_errors:
+            errors.append({'line': line_number, 'errors': field_errors})
+        elif user.email not in users:
+            users[user.email] = user
+            passwords[user.email] = str(record.get('password') or '') or None
+
+    # One IN query per batch; earlier batches are already inserted, so this also catches
+    # duplicates across the whole file
+    existing = set(User.objects.filter(email__in=users).values_list('email', flat=True))
+    new_users = [user for email, user in users.items() if email not in existing]
+
+    hashed = hash_passwords([passwords[user.email] for user in new_users])
+    for user, password in zip(new_users, hashed):
+        user.password = password
+    User.objects.bulk_create(new_users)
+
+    return {
+        'created': len(new_users),
+        'duplicates': len(rows) - len(errors) - len(new_users),
+        'errors': errors,
+    }
+
+
+@contextmanager
+def _password_hasher(workers):
+    if not workers:
+        yield lambda passwords: [make_password(password) for password in passwords]
+        return
+
+    # Password hashing is deliberately CPU-heavy, so it runs in worker processes. They are
+    # spawned rather than forked (the parent has threads and open database connections)
+    # and only start once there is something to hash.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=django.setup
+    ) as pool:
+        yield lambda passwords: list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def provision_users(records, batch_size=None, workers=None):
+    """
+    Create users from (line_number, record) pairs (see read_records) in batches of
+    `batch_size`, skipping emails that already exist. Records without a password get an
+    unusable one. Passwords are hashed in `workers` processes (default
+    USER_PROVISION_HASH_WORKERS), or in the calling thread with workers=0.
+    Yields {'created', 'duplicates', 'errors'} per batch.
+    """
+    batch_size = batch_size or settings.USER_PROVISION_BATCH_SIZE
+    workers = settings.USER_PROVISION_HASH_WORKERS if workers is None else workers
+    records = iter(records)
+
+    with _password_hasher(workers) as hash_passwords:
+        while batch := list(islice(records, batch_size)):
+            yield _provision_batch(batch, hash_passwords)
+
+
+def _count_of(queryset, user_field):
+    """Per-user row count as a correlated subquery, so several counts don't multiply joined rows."""
+    counts = queryset.filter(**{user_field: OuterRef('pk')}).order_by().values(user_field).annotate(count=Count('pk'))
+    return Coalesce(Subquery(counts.values('count')), 0)
+
+
+class _Echo:
+    """File-like object whose write() returns the line, so csv.writer can feed a streaming response."""
+    def write(self, value):
+        return value
+
+
+def export_users(file_format):
+    """
+    Yield all users with their video and chat counts as CSV or JSON Lines text, reading
+    the table in USER_EXPORT_CHUNK_SIZE chunks so memory stays flat for any number of users.
+    """
+    users = User.objects.annotate(
+        video_count=_count_of(Video.objects.all(), 'uploaded_by'),
+        chat_count=_count_of(VideoChat.objects.all(), 'user'),
+    ).order_by('id').values(*EXPORT_FIELDS)
+
+    writer = csv.DictWriter(_Echo(), fieldnames=EXPORT_FIELDS)
+    if file_format == 'csv':
+        yield writer.writeheader()
+
+    for user in users.iterator(chunk_size=settings.USER_EXPORT_CHUNK_SIZE):
+        user['date_joined'] = user['date_joined'].isoformat()
+        yield writer.writerow(user) if file_format == 'csv' else orjson.dumps(user).decode() + '\n'
+
+
+####    TESTS    ####
+
+
+def test_provision_users_validates_and_skips_existing_emails(db):
+    User.objects.create_user(email='taken@example.com', password='password')
+    lines = [
+        '{"email": "New@Example.com", "password": "s3cret-Pass", "first_name": "Ada"}',
+        '{"email": "taken@example.com"}',
+        'not json',
+        '{"email": "not-an-email"}',
+        # Same address once the domain is normalized
+        '{"email": "New@EXAMPLE.COM"}',
+    ]
+
+    results = list(provision_users(read_records(io.StringIO('\n'.join(lines)), 'jsonl'), batch_size=2, workers=0))
+    assert [(result['created'], result['duplicates']) for result in results] == [(1, 1), (0, 0), (0, 1)]
+    assert [error['line'] for result in results for error in result['errors']] == [3, 4]
+
+    user = User.objects.get(email='New@example.com')
+    assert (user.first_name, user.check_password('s3cret-Pass')) == ('Ada', True)
+    assert not User.objects.get(email='taken@example.com').check_password('')
@@ -0,0 +1,132 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from rest_framework.throttling import SimpleRateThrottle
+
+from django.core.cache import cache
+
+# Seconds a bucket lock may be held (a crashed worker's lock expires after this), and how
+# long a request waits for a contended bucket before it is treated as part of a burst
+BUCKET_LOCK_TIMEOUT = 1
+BUCKET_LOCK_WAIT = 0.1
+BUCKET_LOCK_POLL_INTERVAL = 0.005
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket rate limiter keyed by user (or client IP for anonymous requests).
+
+    The scope's rate in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] sets both the bucket
+    size and the refill speed: '10/min' allows a burst of 10 requests and then one more
+    every 6 seconds. Buckets live in the default cache so every worker shares them.
+    """
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        self.tokens = 0
+        if not self._lock_bucket():
+            return False
+
+        try:
+            self.now = self.timer()
+            # Refill the bucket for the time elapsed since the last request
+            tokens, updated_at = self.cache.get(self.key, (self.num_requests, self.now))
+            refilled = tokens + (self.now - updated_at) * self.num_requests / self.duration
+            self.tokens = min(self.num_requests, refilled)
+
+            if self.tokens < 1:
+                return False
+
+            # An untouched bucket is full again after one period, so let it expire then
+            self.cache.set(self.key, (self.tokens - 1, self.now), self.duration)
+            return True
+        finally:
+            self.cache.delete(f'{self.key}_lock')
+
+    def _lock_bucket(self):
+        """
+        Take the bucket's lock so concurrent requests can't all read the same token count.
+        cache.add is atomic on every backend (SET NX on Redis). Returns False if the bucket
+        stays locked for BUCKET_LOCK_WAIT, which only happens under a burst anyway.
+        """
+        deadline = time.monotonic() + BUCKET_LOCK_WAIT
+        while not self.cache.add(f'{self.key}_lock', 1, BUCKET_LOCK_TIMEOUT):
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(BUCKET_LOCK_POLL_INTERVAL)
+        return True
+
+    def wait(self):
+        return (1 - self.tokens) * self.duration / self.num_requests
+
+
+class PasswordChangeThrottle(TokenBucketThrottle):
+    scope = 'password_change'
+
+
+####    TESTS    ####
+
+
+class _FivePerMinuteThrottle(TokenBucketThrottle):
+    scope = 'tests'
+    rate = '5/min'
+
+
+class _SlowReadCache:
+    """The default cache with slow reads, so an unsynchronised read-modify-write would race."""
+
+    def __init__(self, wrapped):
+        self.wrapped = wrapped
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+    def get(self, *args, **kwargs):
+        value = self.wrapped.get(*args, **kwargs)
+        time.sleep(0.01)
+        return value
+
+
+def _request(user_id=1):
+    return SimpleNamespace(user=SimpleNamespace(is_authenticated=True, pk=user_id))
+
+
+def test_token_bucket_allows_a_burst_then_refills(monkeypatch):
+    cache.clear()
+    now = [1000.0]
+    monkeypatch.setattr(_FivePerMinuteThrottle, 'timer', lambda self: now[0])
+    throttle = _FivePerMinuteThrottle()
+
+    assert [throttle.allow_request(_request(), None) for _ in range(6)] == [True] * 5 + [False]
+    assert throttle.wait() == 12
+
+    now[0] += 12
+    assert throttle.allow_request(_request(), None)
+    assert not throttle.allow_request(_request(), None)
+    assert _FivePerMinuteThrottle().allow_request(_request(user_id=2), None)
+
+
+def test_token_bucket_admits_only_its_size_from_concurrent_requests(monkeypatch):
+    cache.clear()
+    monkeypatch.setattr(_FivePerMinuteThrottle, 'cache', _SlowReadCache(cache))
+    start = threading.Barrier(20)
+
+    def request():
+        start.wait()
+        return _FivePerMinuteThrottle().allow_request(_request(), None)
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        results = [pool.submit(request) for _ in range(20)]
+    assert sum(result.result() for result in results) == 5
@@ -1,7 +1,8 @@
 from django.urls import path
 from users.views import (
     signup_view, login_view, logout_view,
-    profile_view, request_password_change, verify_and_change_password
+    profile_view, request_password_change, verify_and_change_password,
+    provision_users_view, export_users_view
 )
 
 urlpatterns = [
@@ -11,4 +12,6 @@ urlpatterns = [
     path('profile/', profile_view, name='profile'),
     path('request-password-change/', request_password_change, name='request_password_change'),
     path('change-password/', verify_and_change_password, name='change_password'),
+    path('users/provision/', provision_users_view, name='provision_users'),
+    path('users/export/', export_users_view, name='export_users'),
 ]
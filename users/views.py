@@ -1,14 +1,22 @@
 from django.contrib.auth import authenticate, login, logout
 from django.core.cache import cache # TODO: Use Redis for production
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.mail import send_mail
 from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from users.models import User
+from users.provisioning import detect_format, export_users, provision_users, read_records
+from users.throttles import PasswordChangeThrottle
+import io
 import random
 import string
+from itertools import islice
+
+FILE_CONTENT_TYPES = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
 
 
 @api_view(['POST'])
@@ -102,6 +110,7 @@ def profile_view(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([PasswordChangeThrottle])
 def request_password_change(request):
     user = request.user
     
@@ -152,3 +161,77 @@ def verify_and_change_password(request):
     cache.delete(cache_key)
     
     return Response({'message': 'Password changed successfully'})
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def provision_users_view(request):
+    upload = request.FILES.get('file')
+    if not upload:
+        return Response({'error': 'Upload a CSV or JSON Lines file of users as "file".'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Uploads above FILE_UPLOAD_MAX_MEMORY_SIZE are on disk already; records are read line by line
+    file_format = request.data.get('fileFormat') or detect_format(upload.name)
+    if file_format not in FILE_CONTENT_TYPES:
+        return Response({'error': 'fileFormat must be csv or jsonl'}, status=status.HTTP_400_BAD_REQUEST)
+    stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+
+    # Every password costs a deliberately slow hash, done here in the request thread, so a
+    # request takes a bounded number of rows; larger files go through `manage.py provision_users`
+    records = list(islice(read_records(stream, file_format), settings.USER_PROVISION_MAX_REQUEST_ROWS + 1))
+    if len(records) > settings.USER_PROVISION_MAX_REQUEST_ROWS:
+        return Response(
+            {'error': f'Upload at most {settings.USER_PROVISION_MAX_REQUEST_ROWS} users per request. Provision larger files with "manage.py provision_users".'},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+
+    created = duplicates = error_count = 0
+    errors = []
+    for result in provision_users(records, workers=0):
+        created += result['created']
+        duplicates += result['duplicates']
+        error_count += len(result['errors'])
+        errors += result['errors'][:settings.USER_PROVISION_MAX_REPORTED_ERRORS - len(errors)]
+
+    return Response({
+        'created': created,
+        'duplicates': duplicates,
+        'errorCount': error_count,
+        'errors': errors
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_users_view(request):
+    file_format = request.query_params.get('fileFormat', 'csv')
+    if file_format not in FILE_CONTENT_TYPES:
+        return Response({'error': 'fileFormat must be csv or jsonl'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return StreamingHttpResponse(
+        export_users(file_format),
+        content_type=FILE_CONTENT_TYPES[file_format],
+        headers={'Content-Disposition': f'attachment; filename="users.{file_format}"'}
+    )
+
+
+####    TESTS    ####
+
+
+def _upload(client, content, name='users.csv'):
+    return client.post('/api/auth/users/provision/', {'file': SimpleUploadedFile(name, content.encode())})
+
+
+def test_provisioning_api_caps_rows_per_request(client, django_user_model, settings):
+    cache.clear()
+    client.force_login(django_user_model.objects.create_superuser(email='admin@example.com', password='password'))
+    settings.USER_PROVISION_MAX_REQUEST_ROWS = 2
+
+    rows = ''.join(f'user{index}@example.com,\n' for index in range(3))
+    response = _upload(client, 'email,password\n' + rows)
+    assert response.status_code == 413
+    assert User.objects.count() == 1
+
+    response = _upload(client, 'email,password\nnew@example.com,s3cret-Pass\nadmin@example.com,\n')
+    assert response.json() == {'created': 1, 'duplicates': 1, 'errorCount': 0, 'errors': []}
+    assert User.objects.get(email='new@example.com').check_password('s3cret-Pass')
@@ -1,32 +1,129 @@
+from unittest import mock
+
+from django.conf import settings
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from .models import Video, VideoChat, Experiment, Evaluation
 
 
+class EstimatedCountPaginator(Paginator):
+    """
+    Use PostgreSQL's planner estimate (pg_class.reltuples) for unfiltered changelists on large
+    tables instead of an exact COUNT(*). Filtered lists and small tables keep the exact count.
+    """
+
+    @cached_property
+    def count(self):
+        connection = connections[self.object_list.db]
+        if connection.vendor == 'postgresql' and not self.object_list.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                    [self.object_list.model._meta.db_table]
+                )
+                estimate = int(cursor.fetchone()[0])
+            if estimate > settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    """
+    Changelist defaults for tables expected to reach millions of rows: estimated pagination
+    counts, no second full-table count for filtered results, and large JSON columns
+    (list_defer) left out of list queries.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_defer = []
+    trigram_search_fields = []
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.resolver_match.url_name.endswith('_changelist'):
+            queryset = queryset.defer(*self.list_defer)
+        return queryset
+
+    def get_search_fields(self, request):
+        # pg_trgm GIN indexes on UPPER(col::text) (migration 0006) serve icontains on PostgreSQL; other databases
+        # fall back to prefix matching instead of full-table substring scans
+        if connections[self.model.objects.db].vendor == 'postgresql':
+            return self.trigram_search_fields
+        return [f'^{field}' for field in self.trigram_search_fields]
+
+
 @admin.register(Video)
-class VideoAdmin(admin.ModelAdmin):
-    list_display = ['title', 'uploaded_by', 'uploaded_at']
-    list_filter = ['uploaded_at']
-    search_fields = ['title', 'video_path']
+class VideoAdmin(ScalableModelAdmin):
+    list_display = ['title', 'uploaded_by', 'status', 'uploaded_at']
+    list_filter = ['status', 'uploaded_at']
+    list_select_related = ['uploaded_by']
+    list_defer = ['formats', 'download_error']
+    trigram_search_fields = ['title', 'video_path']
+    raw_id_fields = ['uploaded_by']
     readonly_fields = ['uploaded_at']
 
 
 @admin.register(VideoChat)
-class VideoChatAdmin(admin.ModelAdmin):
-    list_display = ['video', 'created_at', 'updated_at']
-    list_filter = ['created_at', 'updated_at']
-    readonly_fields = ['created_at', 'updated_at']
+class VideoChatAdmin(ScalableModelAdmin):
+    list_display = ['video', 'user', 'is_archived', 'created_at', 'updated_at']
+    list_filter = ['is_archived', 'created_at', 'updated_at']
+    list_select_related = ['video', 'user']
+    list_defer = ['chat_history', 'video__formats', 'video__download_error']
+    raw_id_fields = ['video', 'user']
+    readonly_fields = ['is_archived', 'created_at', 'updated_at']
 
 
 @admin.register(Experiment)
-class ExperimentAdmin(admin.ModelAdmin):
+class ExperimentAdmin(ScalableModelAdmin):
     list_display = ['name', 'created_by', 'created_at']
     list_filter = ['created_at']
-    search_fields = ['name', 'description']
+    list_select_related = ['created_by']
+    list_defer = ['description', 'metadata']
+    trigram_search_fields = ['name', 'description']
+    raw_id_fields = ['created_by']
     readonly_fields = ['created_at']
 
 
 @admin.register(Evaluation)
-class EvaluationAdmin(admin.ModelAdmin):
+class EvaluationAdmin(ScalableModelAdmin):
     list_display = ['experiment', 'created_at']
     list_filter = ['created_at']
-    readonly_fields = ['created_at']
\ No newline at end of file
+    list_select_related = ['experiment']
+    list_defer = ['results', 'experiment__description', 'experiment__metadata']
+    raw_id_fields = ['experiment']
+    readonly_fields = ['created_at']
+
+
+####    TESTS    ####
+
+
+def test_paginator_estimates_only_unfiltered_counts_on_postgresql(db, django_user_model, monkeypatch):
+    user = django_user_model.objects.create_user(email='admin@example.com', password='password')
+    Video.objects.bulk_create(Video(uploaded_by=user, title=f'Video {index}') for index in range(3))
+    videos = Video.objects.all()
+
+    assert EstimatedCountPaginator(videos, 2).count == 3
+
+    connection = connections[videos.db]
+    monkeypatch.setattr(connection, 'vendor', 'postgresql')
+    assert EstimatedCountPaginator(videos.filter(title='Video 1'), 2).count == 1
+
+    cursor = mock.MagicMock()
+    cursor.__enter__.return_value.fetchone.return_value = (settings.ADMIN_ESTIMATED_COUNT_THRESHOLD + 1.0,)
+    monkeypatch.setattr(connection, 'cursor', lambda: cursor)
+    assert EstimatedCountPaginator(videos, 2).count == settings.ADMIN_ESTIMATED_COUNT_THRESHOLD + 1
+
+
+def test_search_falls_back_to_prefix_matching_off_postgresql(admin_client, admin_user, monkeypatch):
+    Video.objects.create(uploaded_by=admin_user, title='Lemon cake')
+    Video.objects.create(uploaded_by=admin_user, title='Baking a lemon tart')
+    video_admin = admin.site._registry[Video]
+
+    assert video_admin.get_search_fields(None) == ['^title', '^video_path']
+    response = admin_client.get('/admin/videos/video/', {'q': 'lemon'})
+    assert [video.title for video in response.context['cl'].result_list] == ['Lemon cake']
+
+    monkeypatch.setattr(connections[Video.objects.db], 'vendor', 'postgresql')
+    assert video_admin.get_search_fields(None) == ['title', 'video_path']
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class VideosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'videos'
+
+    def ready(self):
+        import videos.signals  # noqa: F401
+
+        if settings.PRELOAD_HEAVY_DEPENDENCIES:
+            from videos.warmup import warm_up
+            warm_up()
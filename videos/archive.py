@@ -0,0 +1,132 @@
+import datetime as dt
+import gzip
+
+import orjson
+import zstandard
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from videos.models import Video, VideoChat, VideoChatArchive
+
+CODECS = {
+    VideoChatArchive.Codec.GZIP: (gzip.compress, gzip.decompress),
+    VideoChatArchive.Codec.ZSTD: (zstandard.compress, zstandard.decompress),
+}
+
+
+def compress_history(history, codec=None):
+    """Serialize a chat_history list to JSON and compress it. Returns (codec, payload, original_size)."""
+    codec = codec or settings.CHAT_ARCHIVE_CODEC
+    compress, _ = CODECS[codec]
+    raw = orjson.dumps(history)
+    return codec, compress(raw), len(raw)
+
+
+def chat_history(chat):
+    """The chat's messages, read from its archive row if the chat has been archived."""
+    if not chat.is_archived:
+        return chat.chat_history
+
+    _, decompress = CODECS[chat.archive.codec]
+    return orjson.loads(decompress(bytes(chat.archive.payload)))
+
+
+def rehydrate(chat):
+    """Move an archived chat's history back into the hot table, e.g. before appending to it."""
+    if not chat.is_archived:
+        return chat
+
+    chat.chat_history = chat_history(chat)
+    with transaction.atomic():
+        # update() leaves updated_at alone: rehydrating changes nothing clients can see
+        VideoChat.objects.filter(id=chat.id).update(chat_history=chat.chat_history, is_archived=False)
+        VideoChatArchive.objects.filter(chat_id=chat.id).delete()
+    chat.is_archived = False
+    return chat
+
+
+def _archive_batch(chats, cutoff, codec):
+    ids = [chat.id for chat in chats]
+    archives = []
+    for chat in chats:
+        chat_codec, payload, original_size = compress_history(chat.chat_history, codec)
+        archives.append(VideoChatArchive(chat_id=chat.id, codec=chat_codec, payload=payload, original_size=original_size))
+
+    with transaction.atomic():
+        # Left over from a chat that was written to while it was being archived
+        VideoChatArchive.objects.filter(chat_id__in=ids).delete()
+        VideoChatArchive.objects.bulk_create(archives)
+        # Chats written to since they were read keep their history and drop the new archive row
+        archived = VideoChat.objects.filter(
+            id__in=ids,
+            is_archived=False,
+            updated_at__lt=cutoff
+        ).update(chat_history=[], is_archived=True)
+        VideoChatArchive.objects.filter(chat_id__in=ids, chat__is_archived=False).delete()
+    return archived
+
+
+def archive_chats(older_than=None, batch_size=None, codec=None):
+    """
+    Compress the history of chats not updated for `older_than` (default CHAT_ARCHIVE_AFTER_DAYS)
+    into VideoChatArchive rows, leaving slim stub rows behind. Works through the table in
+    batches of `batch_size` chats, yielding the number archived per batch.
+    """
+    cutoff = timezone.now() - (older_than or dt.timedelta(days=settings.CHAT_ARCHIVE_AFTER_DAYS))
+    batch_size = batch_size or settings.CHAT_ARCHIVE_BATCH_SIZE
+    chats = VideoChat.objects.filter(is_archived=False, updated_at__lt=cutoff).only('id', 'chat_history').order_by('id')
+
+    # Keyset pagination rather than one long-lived cursor, since each batch writes to the table
+    # being read; only one batch of histories is held in memory at a time
+    last_id = 0
+    while True:
+        batch = list(chats.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        yield _archive_batch(batch, cutoff, codec)
+        last_id = batch[-1].id
+
+
+def archive_stats():
+    """Hot and archived chat counts and sizes, plus on-disk table sizes on PostgreSQL."""
+    stats = {
+        'hot_chats': VideoChat.objects.filter(is_archived=False).count(),
+        **VideoChatArchive.objects.aggregate(
+            archived_chats=Count('pk'),
+            original_bytes=Sum('original_size', default=0),
+            compressed_bytes=Sum(Length('payload'), default=0)
+        ),
+    }
+
+    connection = connections[VideoChat.objects.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_total_relation_size(%s::regclass), pg_total_relation_size(%s::regclass)',
+                [VideoChat._meta.db_table, VideoChatArchive._meta.db_table]
+            )
+            stats['hot_table_bytes'], stats['archive_table_bytes'] = cursor.fetchone()
+    return stats
+
+
+####    TESTS    ####
+
+
+def test_archived_chats_keep_their_list_fields_and_rehydrate(db, django_user_model):
+    user = django_user_model.objects.create_user(email='archivist@example.com', password='password')
+    history = [{'query': 'first', 'response': {'response': 'one'}}, {'query': 'second', 'response': {'response': 'two'}}]
+    chat = VideoChat.objects.create(video=Video.objects.create(uploaded_by=user), user=user, chat_history=history)
+    VideoChat.objects.filter(id=chat.id).update(updated_at=timezone.now() - dt.timedelta(days=settings.CHAT_ARCHIVE_AFTER_DAYS + 1))
+
+    assert sum(archive_chats()) == 1
+    chat = VideoChat.objects.get(id=chat.id)
+    assert (chat.is_archived, chat.chat_history, chat.message_count, chat.last_message) == (True, [], 2, 'second')
+    assert chat_history(chat) == history
+
+    rehydrate(chat)
+    chat = VideoChat.objects.get(id=chat.id)
+    assert (chat.is_archived, chat.chat_history) == (False, history)
+    assert not VideoChatArchive.objects.exists()
@@ -0,0 +1,127 @@
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+
+from videos.links import normalize_url
+from videos.models import Video
+from videos.pipeline import ensure_media
+from videos.providers import media_provider
+from videos.throttles import GLOBAL_INGEST_KEY
+
+# Shared by API-triggered imports so a worker never runs more than
+# VIDEO_IMPORT_MAX_WORKERS downloads at once, however many imports are queued. This is the
+# import cap: imports do not take the interactive ingest slots (videos.throttles), so a
+# long import neither sheds the owner's questions nor parks pool threads waiting for a slot
+download_executor = ThreadPoolExecutor(
+    max_workers=settings.VIDEO_IMPORT_MAX_WORKERS,
+    thread_name_prefix='video-import',
+)
+
+
+def expand_urls(urls):
+    """
+    Resolve video and playlist URLs into individual video entries via the media provider's
+    metadata extraction (no media is downloaded). Returns (entries, failed_urls).
+    """
+    provider = media_provider()
+    # Different spellings of the same video are extracted once
+    urls = list(dict.fromkeys(normalize_url(url) for url in urls))
+    with ThreadPoolExecutor(max_workers=settings.VIDEO_IMPORT_MAX_WORKERS) as pool:
+        results = list(pool.map(provider.extract_entries, urls))
+
+    entries = []
+    failed_urls = []
+    for url, result in zip(urls, results):
+        if result is None:
+            failed_urls.append(url)
+        else:
+            entries.extend(result)
+    return entries, failed_urls
+
+
+def create_videos(user, entries):
+    """Create pending Video rows for entries the user has not imported yet, in one bulk insert."""
+    existing_ids = set(Video.objects.filter(
+        uploaded_by=user,
+        source_id__in=[entry['source_id'] for entry in entries]
+    ).values_list('source_provider', 'source_id'))
+
+    new_videos = {}
+    queued_at = timezone.now()
+    for entry in entries:
+        key = (entry['source_provider'], entry['source_id'])
+        if key not in existing_ids and key not in new_videos:
+            new_videos[key] = Video(status=Video.Status.PENDING, download_queued_at=queued_at, uploaded_by=user, **entry)
+
+    return Video.objects.bulk_create(new_videos.values(), batch_size=settings.VIDEO_IMPORT_BATCH_SIZE)
+
+
+def download_video(video):
+    close_old_connections()
+    ensure_media(video)
+
+
+def _record_failure(video):
+    def callback(future):
+        if future.exception():
+            Video.objects.filter(id=video.id).update(
+                status=Video.Status.FAILED,
+                download_error=str(future.exception())
+            )
+    return callback
+
+
+def schedule_downloads(videos, executor=download_executor):
+    """Queue downloads on the executor, marking videos failed if their download raises."""
+    futures = {}
+    for video in videos:
+        future = executor.submit(download_video, video)
+        future.add_done_callback(_record_failure(video))
+        futures[future] = video
+    return futures
+
+
+def stale_downloads(older_than=None):
+    """
+    Imported videos still pending or downloading `older_than` (default VIDEO_DOWNLOAD_STALE_AFTER
+    seconds) after they were queued. Downloads run in the worker process that queued them, so
+    these were lost to a restart or crash and nothing will finish them.
+    """
+    cutoff = timezone.now() - (older_than or dt.timedelta(seconds=settings.VIDEO_DOWNLOAD_STALE_AFTER))
+    return Video.objects.filter(
+        status__in=[Video.Status.PENDING, Video.Status.DOWNLOADING],
+        download_queued_at__lt=cutoff
+    )
+
+
+def video_progress(video):
+    return {
+        'id': video.id,
+        'url': video.source_url,
+        'title': video.title,
+        'status': video.status,
+        'error': video.download_error,
+    }
+
+
+####    TESTS    ####
+
+
+def test_import_downloads_leave_the_owners_ingest_slots_free(db, django_user_model, monkeypatch):
+    cache.clear()
+    user = django_user_model.objects.create_user(email='importer@example.com', password='password')
+    videos = [Video.objects.create(uploaded_by=user, status=Video.Status.PENDING) for _ in range(3)]
+    slots = []
+    monkeypatch.setattr(
+        'videos.importer.ensure_media',
+        lambda video: slots.append((cache.get(GLOBAL_INGEST_KEY), cache.get(f'{GLOBAL_INGEST_KEY}_{user.id}')))
+    )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        futures = schedule_downloads(videos, executor)
+    assert all(future.exception() is None for future in futures)
+    assert slots == [(None, None)] * 3
@@ -0,0 +1,106 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+
+URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+# Provider names match yt-dlp's extractor keys (lowercased), so canonical keys line up with
+# Video.source_provider / Video.source_id
+PROVIDER_PATTERNS = [
+    ('youtube', 'https://www.youtube.com/watch?v={}', re.compile(
+        r'^https?://(?:(?:www|m|music)\.)?(?:youtube\.com|youtube-nocookie\.com)/'
+        r'(?:watch\?(?:\S*&)?v=|shorts/|embed/|live/|v/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])'
+        r'|^https?://youtu\.be/([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])', re.IGNORECASE)),
+    ('vimeo', 'https://vimeo.com/{}', re.compile(
+        r'^https?://(?:www\.|player\.)?vimeo\.com/(?:video/)?(\d+)(?!\d)', re.IGNORECASE)),
+    ('dailymotion', 'https://www.dailymotion.com/video/{}', re.compile(
+        r'^https?://(?:www\.)?dailymotion\.com/(?:embed/)?video/([a-z0-9]+)'
+        r'|^https?://dai\.ly/([a-z0-9]+)', re.IGNORECASE)),
+]
+# Same shape, for URLs only the active media provider serves (MediaProvider.url_patterns)
+_media_provider_patterns = []
+
+
+class CanonicalVideo(NamedTuple):
+    provider: str
+    video_id: str
+    url: str
+
+    @property
+    def key(self):
+        """Stable dedup/cache key, e.g. 'youtube:dQw4w9WgXcQ'."""
+        return f'{self.provider}:{self.video_id}'
+
+
+def is_valid_url(url):
+    return bool(URL_PATTERN.match(url))
+
+
+@lru_cache(maxsize=settings.VIDEO_URL_CACHE_SIZE)
+def canonicalize(url):
+    """
+    Map any supported URL form (watch, shorts, embed, short links, ...) to its provider and
+    video id. Returns None for URLs of other providers, which then go through yt-dlp as-is.
+    """
+    for provider, canonical_url, pattern in PROVIDER_PATTERNS + _media_provider_patterns:
+        match = pattern.match(url.strip())
+        if match:
+            video_id = next(group for group in match.groups() if group)
+            return CanonicalVideo(provider, video_id, canonical_url.format(video_id))
+    return None
+
+
+def set_media_provider_patterns(patterns):
+    """Canonicalize the active media provider's own URLs as well (see videos.providers)."""
+    _media_provider_patterns[:] = patterns
+    canonicalize.cache_clear()
+
+
+def normalize_url(url):
+    """
+    The canonical URL of a video link, so different spellings of it are extracted once. Links
+    that also name a playlist (watch?v=...&list=PL...) are kept as they are: importing one
+    means importing the playlist.
+    """
+    canonical = canonicalize(url)
+    if not canonical or 'list' in parse_qs(urlparse(url).query):
+        return url
+    return canonical.url
+
+
+####    TESTS    ####
+
+
+def test_canonicalize_maps_every_url_form_to_one_video():
+    urls = [
+        'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+        'https://m.youtube.com/watch?feature=share&v=dQw4w9WgXcQ',
+        'https://youtu.be/dQw4w9WgXcQ?t=42',
+        'https://www.youtube.com/shorts/dQw4w9WgXcQ',
+        'https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ',
+        ' https://www.youtube.com/live/dQw4w9WgXcQ ',
+    ]
+    assert {canonicalize(url) for url in urls} == {
+        CanonicalVideo('youtube', 'dQw4w9WgXcQ', 'https://www.youtube.com/watch?v=dQw4w9WgXcQ')
+    }
+    assert canonicalize('https://player.vimeo.com/video/76979871').key == 'vimeo:76979871'
+    assert canonicalize('https://dai.ly/x8abc12').key == 'dailymotion:x8abc12'
+    # Ids one character too long, and providers yt-dlp handles without a canonical form
+    assert canonicalize('https://youtu.be/dQw4w9WgXcQx') is None
+    assert canonicalize('https://example.com/video.mp4') is None
+
+
+def test_normalize_url_keeps_playlist_links():
+    assert normalize_url('https://youtu.be/dQw4w9WgXcQ') == 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+    playlist_url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLabc123'
+    assert normalize_url(playlist_url) == playlist_url
+    assert normalize_url('https://example.com/video.mp4') == 'https://example.com/video.mp4'
@@ -0,0 +1,37 @@
+import datetime as dt
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from videos.archive import archive_chats, archive_stats
+from videos.models import VideoChatArchive
+
+
+class Command(BaseCommand):
+    help = 'Compress chats untouched for a given number of days out of the hot VideoChat table, in bounded-memory batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.CHAT_ARCHIVE_AFTER_DAYS, help='Archive chats not updated for this many days')
+        parser.add_argument('--batch-size', type=int, default=settings.CHAT_ARCHIVE_BATCH_SIZE, help='Chats compressed and written per transaction')
+        parser.add_argument('--codec', choices=VideoChatArchive.Codec.values, default=settings.CHAT_ARCHIVE_CODEC)
+        parser.add_argument('--stats', action='store_true', help='Only print hot/archive table metrics')
+
+    def _write_stats(self):
+        stats = archive_stats()
+        ratio = stats['original_bytes'] / stats['compressed_bytes'] if stats['compressed_bytes'] else 0
+        self.stdout.write(
+            f"Hot chats: {stats['hot_chats']:,}  archived chats: {stats['archived_chats']:,}  "
+            f"archived history: {stats['original_bytes']:,} B -> {stats['compressed_bytes']:,} B ({ratio:.1f}x)"
+        )
+        if 'hot_table_bytes' in stats:
+            self.stdout.write(f"Hot table: {stats['hot_table_bytes']:,} B  archive table: {stats['archive_table_bytes']:,} B")
+
+    def handle(self, *args, **options):
+        if not options['stats']:
+            total = 0
+            batches = archive_chats(dt.timedelta(days=options['days']), options['batch_size'], options['codec'])
+            for archived in batches:
+                total += archived
+                self.stdout.write(f'Archived {total:,} chats')
+            self.stdout.write(self.style.SUCCESS(f'Archived {total:,} chats not updated for {options["days"]} days'))
+        self._write_stats()
@@ -0,0 +1,93 @@
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def parse_importtime(output):
+    """Parse `python -X importtime` output into (module, depth, self_us, cumulative_us) rows."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Profile a cold start with `python -X importtime` and summarise where import time goes. '
+        'Fails if a module that should load lazily is imported at startup.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--module', action='append', dest='modules',
+            help='Module to import after django.setup(), repeatable (default: ROOT_URLCONF, i.e. every view)'
+        )
+        parser.add_argument('--top', type=int, default=15, help='Rows per table')
+        parser.add_argument(
+            '--lazy', action='append', default=None,
+            help='Module that must not be imported at startup, repeatable (default: yt_dlp, boto3)'
+        )
+
+    def handle(self, *args, **options):
+        modules = options['modules'] or [settings.ROOT_URLCONF]
+        lazy_modules = options['lazy'] or ['yt_dlp', 'boto3']
+        script = 'import django; django.setup(); ' + '; '.join(f'import {module}' for module in modules)
+
+        # A fresh interpreter, so nothing this process already imported hides the cost
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            capture_output=True, text=True, cwd=settings.BASE_DIR
+        )
+        if result.returncode:
+            raise CommandError(f'Importing {", ".join(modules)} failed:\n{result.stderr[-2000:]}')
+
+        rows = parse_importtime(result.stderr)
+        total_us = sum(cumulative_us for _, depth, _, cumulative_us in rows if depth == 0)
+        self.stdout.write(f'Cold start importing {", ".join(modules)}: {total_us / 1000:,.1f} ms, {len(rows)} modules\n')
+
+        by_package = defaultdict(int)
+        for name, _, self_us, _ in rows:
+            by_package[name.split('.')[0]] += self_us
+        self.stdout.write(f'{"Package":<40} {"self ms":>10} {"share":>7}')
+        for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'{package:<40} {self_us / 1000:>10,.1f} {self_us / total_us:>7.1%}')
+
+        self.stdout.write(f'\n{"Slowest imports":<60} {"cumulative ms":>14}')
+        for name, _, _, cumulative_us in sorted(rows, key=lambda row: -row[3])[:options['top']]:
+            self.stdout.write(f'{name:<60} {cumulative_us / 1000:>14,.1f}')
+
+        imported = {name for name, _, _, _ in rows}
+        eager = [module for module in lazy_modules if module in imported]
+        if eager:
+            raise CommandError(f'Imported at startup but expected to load lazily: {", ".join(eager)}')
+        self.stdout.write(self.style.SUCCESS(f'\nNot imported at startup: {", ".join(lazy_modules)}'))
+
+
+####    TESTS    ####
+
+
+def test_parse_importtime_reads_depth_and_both_timings():
+    output = '\n'.join([
+        'import time: self [us] | cumulative | imported package',
+        'import time:       287 |        287 |       _json',
+        'import time:       671 |        958 |     json.scanner',
+        'import time:       641 |       1598 |   json.decoder',
+        'import time:       764 |        764 |   json.encoder',
+        'import time:       475 |       2836 | json',
+        'Traceback lines and other stderr output are ignored',
+    ])
+
+    assert parse_importtime(output) == [
+        ('_json', 3, 287, 287),
+        ('json.scanner', 2, 671, 958),
+        ('json.decoder', 1, 641, 1598),
+        ('json.encoder', 1, 764, 764),
+        ('json', 0, 475, 2836),
+    ]
@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.models import User
+from videos.importer import create_videos, expand_urls, schedule_downloads
+
+
+class Command(BaseCommand):
+    help = 'Bulk import videos or playlists for a user: expand URLs via yt-dlp, create Video rows, then download with bounded parallelism.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*', help='Video or playlist URLs')
+        parser.add_argument('--user', required=True, help='Email of the user that owns the imported videos')
+        parser.add_argument('--file', help='Text file with one video or playlist URL per line')
+        parser.add_argument('--workers', type=int, default=settings.VIDEO_IMPORT_MAX_WORKERS, help='Maximum concurrent downloads')
+
+    def handle(self, *args, **options):
+        user = User.objects.get(email=options['user'])
+        urls = list(options['urls'])
+        if options['file']:
+            with open(options['file']) as url_file:
+                urls += [line.strip() for line in url_file if line.strip()]
+
+        entries, failed_urls = expand_urls(urls)
+        for url in failed_urls:
+            self.stderr.write(f'Could not extract {url}')
+
+        videos = create_videos(user, entries)
+        self.stdout.write(f'Found {len(entries)} videos, {len(videos)} new, {len(entries) - len(videos)} already imported')
+
+        self.download(videos, options['workers'])
+
+    def download(self, videos, workers):
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = schedule_downloads(videos, executor)
+            for done, future in enumerate(as_completed(futures), start=1):
+                video = futures[future]
+                if future.exception():
+                    self.stderr.write(f'[{done}/{len(videos)}] failed {video.source_url}: {future.exception()}')
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'[{done}/{len(videos)}] downloaded {video.title or video.source_url}'))
@@ -0,0 +1,142 @@
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from users.models import User
+from videos.models import Video, VideoChat
+from videos.providers import SyntheticProvider, override_media_provider
+from videos.storage import video_storage
+
+METADATA_QUERY = 'How long is this video and what is it called?'
+ANALYSIS_QUERY = 'Explain what happens in this video.'
+
+
+def _percentile(sorted_values, percent):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Offline load test of ingestion, caching and analysis: concurrent simulated users call the '
+        'process API while SyntheticProvider serves generated videos with injected latency and failures. '
+        'Responses go through the real throttles and admission control, so 429s are part of the result.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help='Simulated users')
+        parser.add_argument('--requests', type=int, default=200, help='Total process requests')
+        parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight at once')
+        parser.add_argument('--videos', type=int, default=50, help='Distinct videos requested (fewer means more cache hits)')
+        parser.add_argument('--metadata-ratio', type=float, default=0.5, help='Share of questions answerable from metadata')
+        parser.add_argument('--duration', type=int, help='Synthetic video length in seconds')
+        parser.add_argument('--bitrate-kbps', type=int, help='Synthetic video bitrate')
+        parser.add_argument('--latency', type=float, help='Mean seconds added to every provider call')
+        parser.add_argument('--failure-rate', type=float, help='Probability that a provider call fails')
+        parser.add_argument('--throughput', type=int, help='Download speed cap in bytes/s (0 = unlimited)')
+        parser.add_argument('--media-dir', help='Serve media files from this directory instead of generating them')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the request mix and provider')
+        parser.add_argument('--keep', action='store_true', help='Keep the load-test users, videos and chats')
+        parser.add_argument('--allow-production', action='store_true', help='Run even though DEBUG is off')
+
+    def _create_users(self, count):
+        emails = [f'loadtest-{index}@synthetic.local' for index in range(count)]
+        User.objects.bulk_create(
+            [User(email=email, password=make_password(None)) for email in emails],
+            ignore_conflicts=True
+        )
+        return list(User.objects.filter(email__in=emails))
+
+    def _cleanup(self, users):
+        VideoChat.objects.filter(user__in=users).delete()
+        videos = Video.objects.filter(uploaded_by__in=users)
+        for path in videos.exclude(video_path='').values_list('video_path', flat=True):
+            video_storage().delete(path)
+        videos.delete()
+        User.objects.filter(id__in=[user.id for user in users]).delete()
+
+    def handle(self, *args, **options):
+        # It creates users and fills video storage in whatever database and bucket are configured
+        if not settings.DEBUG and not options['allow_production']:
+            raise CommandError('loadtest_ingest writes users, videos and media to the configured database and storage. '
+                               'Run it with DEBUG on, or pass --allow-production to run it anyway.')
+
+        provider_options = {
+            key: options[key] for key in ['duration', 'bitrate_kbps', 'latency', 'failure_rate', 'throughput', 'media_dir', 'seed']
+            if options[key] is not None
+        }
+        provider = SyntheticProvider(**provider_options)
+        users = self._create_users(options['users'])
+
+        mix = random.Random(options['seed'])
+        plan = [
+            (
+                mix.choice(users),
+                f'https://synthetic.local/videos/loadtest-{mix.randrange(options["videos"])}',
+                'metadata' if mix.random() < options['metadata_ratio'] else 'analysis',
+            )
+            for _ in range(options['requests'])
+        ]
+
+        # One logged-in client per user and thread; the session is created outside the timings
+        host = next((host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost')
+        local = threading.local()
+
+        def client_for(user):
+            clients = local.__dict__.setdefault('clients', {})
+            if user.id not in clients:
+                clients[user.id] = Client(HTTP_HOST=host, raise_request_exception=False)
+                clients[user.id].force_login(user)
+            return clients[user.id]
+
+        def run(step):
+            user, url, kind = step
+            client = client_for(user)
+            start = time.perf_counter()
+            response = client.post(
+                '/api/videos/process/',
+                {'videoUrl': url, 'query': METADATA_QUERY if kind == 'metadata' else ANALYSIS_QUERY},
+                content_type='application/json'
+            )
+            return kind, response.status_code, time.perf_counter() - start
+
+        with override_media_provider(provider), ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            started = time.perf_counter()
+            results = list(pool.map(run, plan))
+            elapsed = time.perf_counter() - started
+
+        self._report(results, elapsed, provider, users)
+        if not options['keep']:
+            self._cleanup(users)
+
+    def _report(self, results, elapsed, provider, users):
+        latencies = defaultdict(list)
+        statuses = defaultdict(Counter)
+        for kind, status_code, seconds in results:
+            latencies[kind].append(seconds)
+            statuses[kind][status_code] += 1
+
+        self.stdout.write(f'{len(results):,} requests in {elapsed:.1f} s ({len(results) / elapsed:,.1f} req/s)\n')
+        self.stdout.write(f'{"Questions":<10} {"count":>6} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"max ms":>8}  statuses')
+        for kind, values in sorted(latencies.items()):
+            values.sort()
+            percentiles = ' '.join(f'{_percentile(values, percent) * 1000:>8.0f}' for percent in [50, 95, 99, 100])
+            status_counts = ', '.join(f'{code}: {count}' for code, count in sorted(statuses[kind].items()))
+            self.stdout.write(f'{kind:<10} {len(values):>6} {percentiles}  {status_counts}')
+
+        videos = Video.objects.filter(uploaded_by__in=users)
+        self.stdout.write(
+            f"\nProvider calls: {provider.stats['metadata']:,} metadata ({provider.stats['metadata_failures']:,} failed), "
+            f"{provider.stats['download']:,} downloads ({provider.stats['download_failures']:,} failed), "
+            f"{provider.stats['bytes'] / 1e6:,.1f} MB written"
+        )
+        self.stdout.write(
+            f'Videos: {videos.count():,} registered, {videos.filter(status=Video.Status.READY).count():,} downloaded; '
+            f'chats: {VideoChat.objects.filter(user__in=users).count():,}'
+        )
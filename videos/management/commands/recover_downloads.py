@@ -0,0 +1,65 @@
+import datetime as dt
+
+from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+
+from videos.importer import stale_downloads
+from videos.management.commands.import_videos import Command as ImportCommand
+from videos.models import Video
+
+INTERRUPTED_ERROR = 'The download was interrupted. Import the video again to retry.'
+
+
+class Command(ImportCommand):
+    help = (
+        'Retry imported videos whose download was lost to a worker restart (still pending or downloading '
+        'VIDEO_DOWNLOAD_STALE_AFTER seconds after being queued), or mark them failed with --fail.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=settings.VIDEO_DOWNLOAD_STALE_AFTER, help='Seconds since the download was queued')
+        parser.add_argument('--fail', action='store_true', help='Mark the downloads failed instead of retrying them')
+        parser.add_argument('--workers', type=int, default=settings.VIDEO_IMPORT_MAX_WORKERS, help='Maximum concurrent downloads')
+
+    def handle(self, *args, **options):
+        stale = stale_downloads(dt.timedelta(seconds=options['older_than']))
+        if options['fail']:
+            failed = stale.update(status=Video.Status.FAILED, download_error=INTERRUPTED_ERROR)
+            self.stdout.write(f'Marked {failed} interrupted downloads failed')
+            return
+
+        videos = list(stale)
+        # Re-stamp first so a second run started meanwhile does not pick the same videos up
+        Video.objects.filter(id__in=[video.id for video in videos]).update(
+            status=Video.Status.PENDING,
+            download_queued_at=timezone.now()
+        )
+        self.stdout.write(f'Retrying {len(videos)} interrupted downloads')
+        self.download(videos, options['workers'])
+
+
+####    TESTS    ####
+
+
+def test_interrupted_downloads_are_retried_or_failed(db, django_user_model, monkeypatch):
+    user = django_user_model.objects.create_user(email='importer@example.com', password='password')
+    long_ago = timezone.now() - dt.timedelta(days=1)
+    lost = Video.objects.create(uploaded_by=user, status=Video.Status.DOWNLOADING, download_queued_at=long_ago)
+    # Registered for a question but never queued for download, so not an import that was lost
+    Video.objects.create(uploaded_by=user, status=Video.Status.PENDING)
+    Video.objects.create(uploaded_by=user, status=Video.Status.PENDING, download_queued_at=timezone.now())
+    Video.objects.create(uploaded_by=user, status=Video.Status.READY, download_queued_at=long_ago)
+
+    assert list(stale_downloads()) == [lost]
+
+    retried = []
+    monkeypatch.setattr('videos.importer.ensure_media', lambda video: retried.append(video.id))
+    call_command('recover_downloads')
+    assert retried == [lost.id]
+    assert not stale_downloads().exists()
+
+    Video.objects.filter(id=lost.id).update(download_queued_at=long_ago)
+    call_command('recover_downloads', fail=True)
+    lost.refresh_from_db()
+    assert (lost.status, lost.download_error) == (Video.Status.FAILED, INTERRUPTED_ERROR)
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-19 11:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0004_video_import_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='duration',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='formats',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='source_id',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='source_provider',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='thumbnail_url',
+            field=models.CharField(blank=True, max_length=1000),
+        ),
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['uploaded_by', 'source_provider', 'source_id'], name='videos_vide_uploade_80aa54_idx'),
+        ),
+        # Videos are looked up by (source_provider, source_id) now, so nothing reads by source_url
+        migrations.RemoveIndex(
+            model_name='video',
+            name='videos_vide_uploade_29ec7e_idx',
+        ),
+    ]
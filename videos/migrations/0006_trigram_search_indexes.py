@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-19 11:31
+
+from django.db import migrations
+
+# (index name, table, column) for the admin's icontains search fields
+TRIGRAM_INDEXES = [
+    ('videos_video_title_trgm', 'videos_video', 'title'),
+    ('videos_video_path_trgm', 'videos_video', 'video_path'),
+    ('videos_experiment_name_trgm', 'videos_experiment', 'name'),
+    ('videos_experiment_desc_trgm', 'videos_experiment', 'description'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm is PostgreSQL-only; other databases use prefix search in the admin instead
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # icontains compiles to UPPER("col"::text) LIKE UPPER(%s) on PostgreSQL, and the planner only
+    # uses an index built on that same expression, not one on the bare column
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)')
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0005_video_metadata'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
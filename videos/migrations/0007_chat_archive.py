@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 11:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0006_trigram_search_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoChatArchive',
+            fields=[
+                ('chat', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive', serialize=False, to='videos.videochat')),
+                ('codec', models.CharField(choices=[('gzip', 'gzip'), ('zstd', 'Zstandard')], max_length=10)),
+                ('payload', models.BinaryField()),
+                ('original_size', models.PositiveIntegerField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='videochat',
+            name='is_archived',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='videochat',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['updated_at'], name='videochat_hot_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-19 11:57
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def stamp_interrupted_downloads(apps, schema_editor):
+    # Downloads already stuck before this field existed; pending rows may be lazily registered
+    # videos nobody asked to download, so only the ones that had started are stamped
+    Video = apps.get_model('videos', 'Video')
+    Video.objects.filter(status='downloading').update(download_queued_at=F('uploaded_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0007_chat_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='download_queued_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(stamp_interrupted_downloads, migrations.RunPython.noop),
+    ]
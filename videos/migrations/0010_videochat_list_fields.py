@@ -0,0 +1,44 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:05
+
+import gzip
+
+import orjson
+import zstandard
+from django.db import migrations, models
+
+DECOMPRESS = {'gzip': gzip.decompress, 'zstd': zstandard.decompress}
+BATCH_SIZE = 1000
+
+
+def fill_list_fields(apps, schema_editor):
+    # Archived chats are decompressed once here so the history list never has to
+    VideoChat = apps.get_model('videos', 'VideoChat')
+    last_id = 0
+    while batch := list(VideoChat.objects.filter(id__gt=last_id).select_related('archive').order_by('id')[:BATCH_SIZE]):
+        for chat in batch:
+            history = orjson.loads(DECOMPRESS[chat.archive.codec](bytes(chat.archive.payload))) if chat.is_archived else chat.chat_history
+            chat.message_count = len(history)
+            chat.last_message = history[-1]['query'] if history else ''
+        VideoChat.objects.bulk_update(batch, ['message_count', 'last_message'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0008_video_download_queued_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videochat',
+            name='last_message',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='videochat',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_list_fields, migrations.RunPython.noop),
+    ]
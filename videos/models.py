@@ -3,13 +3,35 @@ from django.conf import settings
 
 
 class Video(models.Model):
-    video_path = models.CharField(max_length=500)
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        DOWNLOADING = 'downloading', 'Downloading'
+        READY = 'ready', 'Ready'
+        FAILED = 'failed', 'Failed'
+
+    video_path = models.CharField(max_length=500, blank=True)
+    source_url = models.CharField(max_length=500, blank=True)
+    source_provider = models.CharField(max_length=50, blank=True)
+    source_id = models.CharField(max_length=255, blank=True)
     title = models.CharField(max_length=255, blank=True)
+    duration = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail_url = models.CharField(max_length=1000, blank=True)
+    formats = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.READY)
+    download_error = models.TextField(blank=True)
+    # When the current download was queued or started; stale_downloads() finds the ones a restart lost
+    download_queued_at = models.DateTimeField(null=True, blank=True)
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='videos')
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['uploaded_by', 'source_provider', 'source_id']),
+        ]
+
+    def __str__(self):
+        return self.title or self.source_url or f'Video {self.pk}'
 
 class VideoChat(models.Model):
     video = models.ForeignKey(Video, on_delete=models.PROTECT, related_name='chats')
@@ -18,8 +40,49 @@ class VideoChat(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Set once chat_history has been moved to a VideoChatArchive row (see videos.archive)
+    is_archived = models.BooleanField(default=False)
+    # Kept on the row so the history list never needs chat_history, which archived chats lack
+    last_message = models.TextField(blank=True)
+    message_count = models.PositiveIntegerField(default=0)
+
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['user', 'updated_at']),
+            # Only hot chats are scanned for archival, so archived rows stay out of the index
+            models.Index(fields=['updated_at'], condition=models.Q(is_archived=False), name='videochat_hot_updated_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.is_archived:
+            self.message_count = len(self.chat_history)
+            self.last_message = self.chat_history[-1]['query'] if self.chat_history else ''
+        super().save(*args, **kwargs)
+
+class VideoChatArchive(models.Model):
+    """Compressed chat_history of an archived VideoChat, which keeps only a stub row."""
+    class Codec(models.TextChoices):
+        GZIP = 'gzip', 'gzip'
+        ZSTD = 'zstd', 'Zstandard'
+
+    chat = models.OneToOneField(VideoChat, on_delete=models.CASCADE, primary_key=True, related_name='archive')
+    codec = models.CharField(max_length=10, choices=Codec.choices)
+    payload = models.BinaryField()
+    original_size = models.PositiveIntegerField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+class VideoChatTombstone(models.Model):
+    """Marks a deleted VideoChat so delta syncs can tell clients to drop it."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='video_chat_tombstones')
+    chat_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-deleted_at']
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+        ]
 
 
 class Experiment(models.Model):
@@ -32,6 +95,9 @@ class Experiment(models.Model):
     class Meta:
         ordering = ['-created_at']
 
+    def __str__(self):
+        return self.name
+
 class Evaluation(models.Model):
     experiment = models.ForeignKey(Experiment, on_delete=models.PROTECT, related_name='evaluations')
     results = models.JSONField(default=dict)
@@ -0,0 +1,178 @@
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from videos.links import canonicalize
+from videos.models import Video
+from videos.providers import MediaProviderError, SyntheticProvider, media_provider, override_media_provider
+from videos.storage import local_media_path, new_media_name, new_media_path, store_media
+
+# Questions the stored metadata can answer on its own, without downloading the media. A
+# question is only answered from metadata when every clause of it asks about the video itself
+# ("How long is this video and what is it called?"); "How long does the chef bake the cake?"
+# goes to analysis.
+VIDEO_SUBJECT = r"(?:the|this) video|it"
+METADATA_QUESTIONS = {
+    'title': re.compile(
+        rf"what(?: is|'s) (?:the (?:title|name) of (?:{VIDEO_SUBJECT})|(?:{VIDEO_SUBJECT}) (?:called|named|titled))"
+    ),
+    'duration': re.compile(
+        rf"how long is (?:{VIDEO_SUBJECT})|what(?: is|'s) the (?:length|duration|runtime) of (?:{VIDEO_SUBJECT})"
+    ),
+    'quality': re.compile(
+        rf"what (?:resolutions?|quality|formats?) (?:is|are) (?:{VIDEO_SUBJECT})(?: available)? in"
+        rf"|what(?: is|'s) the (?:resolution|quality) of (?:{VIDEO_SUBJECT})"
+    ),
+    'thumbnail': re.compile(
+        rf"(?:what|where) is the thumbnail (?:of|for) (?:{VIDEO_SUBJECT})"
+    ),
+}
+QUESTION_CLAUSE_SEPARATOR = re.compile(r'\s*(?:[?.!,;]|\band\b)\s*')
+
+
+def register_video(user, url):
+    """
+    Get or create the user's Video for a URL from provider metadata only (no download).
+    URLs of known providers are matched on their canonical id first, so a video the user
+    already has costs no network call. Returns None when the URL cannot be extracted.
+    """
+    # Taken first: the provider's own URL patterns take part in canonicalization
+    provider = media_provider()
+    canonical = canonicalize(url)
+    if canonical:
+        video = Video.objects.filter(
+            uploaded_by=user,
+            source_provider=canonical.provider,
+            source_id=canonical.video_id
+        ).first()
+        if video:
+            return video
+
+        # Metadata is shared between users, so a popular video is only extracted once per timeout.
+        # Failed extractions are not cached, so a transient error does not stick for the timeout.
+        cache_key = f'video_metadata_{canonical.key}'
+        metadata = cache.get(cache_key)
+        if metadata is None:
+            metadata = provider.extract_metadata(canonical.url)
+            if metadata:
+                cache.set(cache_key, metadata, settings.VIDEO_METADATA_CACHE_TIMEOUT)
+    else:
+        metadata = provider.extract_metadata(url)
+
+    if not metadata:
+        return None
+
+    video = Video.objects.filter(
+        uploaded_by=user,
+        source_provider=metadata['source_provider'],
+        source_id=metadata['source_id']
+    ).first()
+
+    if not video:
+        video = Video.objects.create(uploaded_by=user, status=Video.Status.PENDING, **metadata)
+    return video
+
+
+def ensure_media(video):
+    """
+    Download the video's media into video storage if it is not there yet and return a
+    local path to read it from. Stages that need pixels or audio call this first. A failed
+    download marks the video failed and raises MediaProviderError. Returns None while
+    another request or import is downloading the same video.
+    """
+    if video.status == Video.Status.READY:
+        return local_media_path(video.video_path)
+
+    # Only the caller that moves the video to downloading fetches it; a download lost to a
+    # worker restart is put back to pending by `manage.py recover_downloads`
+    claimed = Video.objects.filter(
+        id=video.id,
+        status__in=[Video.Status.PENDING, Video.Status.FAILED]
+    ).update(status=Video.Status.DOWNLOADING, download_queued_at=timezone.now())
+    if not claimed:
+        video.refresh_from_db(fields=['status', 'video_path'])
+        return local_media_path(video.video_path) if video.status == Video.Status.READY else None
+
+    name = new_media_name(video.uploaded_by_id)
+    try:
+        media_provider().download(video.source_url, new_media_path(name))
+    except MediaProviderError as error:
+        video.status = Video.Status.FAILED
+        video.download_error = str(error)
+        video.save(update_fields=['status', 'download_error'])
+        raise
+    video.video_path = store_media(name)
+    video.status = Video.Status.READY
+    video.download_error = ''
+    video.save(update_fields=['video_path', 'status', 'download_error'])
+    return local_media_path(video.video_path)
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}:{minutes:02d}:{seconds:02d}' if hours else f'{minutes}:{seconds:02d}'
+
+
+def _metadata_facts(video, topics):
+    facts = []
+    if 'title' in topics and video.title:
+        facts.append(f'The video is titled "{video.title}".')
+    if 'duration' in topics and video.duration:
+        facts.append(f'The video is {_format_duration(video.duration)} long.')
+    heights = sorted({fmt['height'] for fmt in video.formats if fmt.get('height')})
+    if 'quality' in topics and heights:
+        facts.append(f"It is available in {len(video.formats)} formats, up to {heights[-1]}p.")
+    if 'thumbnail' in topics and video.thumbnail_url:
+        facts.append(f'The thumbnail is at {video.thumbnail_url}.')
+    return facts
+
+
+def answer_from_metadata(video, query):
+    """
+    Answer a question that is only about the video's title, length, quality or thumbnail
+    from stored metadata. Returns None when any part of it needs the video content itself.
+    """
+    topics = set()
+    for clause in QUESTION_CLAUSE_SEPARATOR.split(query.strip().lower()):
+        if not clause:
+            continue
+        topic = next((topic for topic, pattern in METADATA_QUESTIONS.items() if pattern.fullmatch(clause)), None)
+        if not topic:
+            return None
+        topics.add(topic)
+
+    facts = _metadata_facts(video, topics)
+    # Every topic asked about has to be known, or the media is needed after all
+    return ' '.join(facts) if topics and len(facts) == len(topics) else None
+
+
+####    TESTS    ####
+
+
+def test_only_questions_about_the_video_itself_are_answered_from_metadata():
+    video = Video(title='Lemon cake', duration=600, formats=[{'height': 720}, {'height': 1080}])
+
+    assert answer_from_metadata(video, 'How long is this video and what is it called?') == (
+        'The video is titled "Lemon cake". The video is 10:00 long.'
+    )
+    assert answer_from_metadata(video, "What's the resolution of the video?") == 'It is available in 2 formats, up to 1080p.'
+    assert answer_from_metadata(video, 'How long does the chef bake the cake?') is None
+    assert answer_from_metadata(video, 'What is the video called and which oven is used?') is None
+    # Asked about, but not in the metadata
+    assert answer_from_metadata(video, 'What is the thumbnail of this video?') is None
+
+
+def test_metadata_is_cached_across_users_but_failures_are_not(db, django_user_model):
+    cache.clear()
+    first, second = [django_user_model.objects.create_user(email=email, password='password') for email in ['a@example.com', 'b@example.com']]
+    provider = SyntheticProvider(failure_rate=1)
+
+    with override_media_provider(provider):
+        assert register_video(first, 'https://synthetic.local/videos/clip') is None
+        provider.failure_rate = 0
+        assert register_video(first, 'https://synthetic.local/videos/clip').title == 'Synthetic video clip'
+        assert register_video(second, 'http://synthetic.local/videos/clip').uploaded_by == second
+    assert provider.stats['metadata'] == 2
@@ -0,0 +1,242 @@
+import os
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from videos.links import canonicalize, set_media_provider_patterns
+from videos.utils import download_youtube_video, extract_video_entries, extract_video_metadata
+
+SYNTHETIC_VIDEO_PATTERN = re.compile(r'^https?://synthetic\.local/videos/([A-Za-z0-9_-]+)(?![A-Za-z0-9_-])', re.IGNORECASE)
+SYNTHETIC_PLAYLIST_PATTERN = re.compile(r'^https?://synthetic\.local/playlists/([A-Za-z0-9_-]+)', re.IGNORECASE)
+SYNTHETIC_CHUNK_SIZE = 1024 * 1024
+
+_provider = None
+
+
+class MediaProviderError(Exception):
+    """Raised by providers when media cannot be downloaded."""
+
+
+class MediaProvider(ABC):
+    """
+    Source of video metadata and media, selected by VIDEO_MEDIA_PROVIDER. Metadata methods
+    return Video field dicts (see videos.utils._video_metadata) or None when the URL cannot
+    be extracted; download() writes the media to a local path or raises. URLs the provider
+    serves itself can be given canonical ids through `url_patterns` (videos.links format),
+    which apply only while the provider is active.
+    """
+    url_patterns = []
+
+    @abstractmethod
+    def extract_metadata(self, url):
+        ...
+
+    @abstractmethod
+    def extract_entries(self, url):
+        ...
+
+    @abstractmethod
+    def download(self, url, output_path):
+        ...
+
+
+class YtDlpProvider(MediaProvider):
+    """YouTube and every other site yt-dlp supports."""
+
+    def extract_metadata(self, url):
+        return extract_video_metadata(url)
+
+    def extract_entries(self, url):
+        return extract_video_entries(url)
+
+    def download(self, url, output_path):
+        # Imported with yt-dlp itself, on first use (videos.utils._youtube_dl)
+        from yt_dlp.utils import DownloadError
+
+        try:
+            download_youtube_video(url, output_path)
+        except DownloadError as error:
+            raise MediaProviderError(str(error)) from error
+
+
+class SyntheticProvider(MediaProvider):
+    """
+    Offline provider for load tests. Serves https://synthetic.local/videos/<id> and
+    https://synthetic.local/playlists/<id>?count=N with the length, resolution and bitrate
+    of VIDEO_SYNTHETIC_OPTIONS (or keyword overrides). Media is copied from `media_dir` when
+    set, otherwise generated on the fly: an MP4 container sized from duration and bitrate
+    whose payload is random bytes, not decodable video. Every call waits about `latency`
+    seconds and fails with probability `failure_rate`; downloads are capped at `throughput`
+    bytes/s. Call counts are kept in `stats`.
+    """
+    url_patterns = [('synthetic', 'https://synthetic.local/videos/{}', SYNTHETIC_VIDEO_PATTERN)]
+
+    def __init__(self, **overrides):
+        options = {**settings.VIDEO_SYNTHETIC_OPTIONS, **overrides}
+        self.duration = options['duration']
+        self.width = options['width']
+        self.height = options['height']
+        self.bitrate_kbps = options['bitrate_kbps']
+        self.latency = options['latency']
+        self.failure_rate = options['failure_rate']
+        self.throughput = options['throughput']
+        self.media_files = sorted(
+            os.path.join(options['media_dir'], filename) for filename in os.listdir(options['media_dir'])
+        ) if options['media_dir'] else []
+
+        self.random = random.Random(options.get('seed'))
+        self.payload_block = self.random.randbytes(SYNTHETIC_CHUNK_SIZE)
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _simulate_call(self, kind):
+        """Count the call, wait the injected latency (+/- 50%) and return False for an injected failure."""
+        self._count(kind)
+        if self.latency:
+            time.sleep(self.latency * self.random.uniform(0.5, 1.5))
+        if self.random.random() < self.failure_rate:
+            self._count(f'{kind}_failures')
+            return False
+        return True
+
+    @property
+    def media_size(self):
+        return self.duration * self.bitrate_kbps * 125
+
+    def _metadata(self, video_id):
+        return {
+            'source_url': f'https://synthetic.local/videos/{video_id}',
+            'source_provider': 'synthetic',
+            'source_id': video_id,
+            'title': f'Synthetic video {video_id}',
+            'duration': self.duration,
+            'thumbnail_url': '',
+            'formats': [{
+                'format_id': f'{self.height}p',
+                'ext': 'mp4',
+                'width': self.width,
+                'height': self.height,
+                'fps': 30,
+                'vcodec': 'avc1',
+                'acodec': 'mp4a',
+                'filesize': self.media_size,
+            }],
+        }
+
+    def _video_id(self, url):
+        video = SYNTHETIC_VIDEO_PATTERN.match(url.strip())
+        return video.group(1) if video else None
+
+    def extract_metadata(self, url):
+        video_id = self._video_id(url)
+        if not video_id or not self._simulate_call('metadata'):
+            return None
+        return self._metadata(video_id)
+
+    def extract_entries(self, url):
+        playlist = SYNTHETIC_PLAYLIST_PATTERN.match(url)
+        if not playlist:
+            metadata = self.extract_metadata(url)
+            return [metadata] if metadata else None
+
+        if not self._simulate_call('entries'):
+            return None
+        count = int(parse_qs(urlparse(url).query).get('count', ['10'])[0])
+        return [self._metadata(f'{playlist.group(1)}-{index}') for index in range(count)]
+
+    def _media_chunks(self, video_id):
+        if self.media_files:
+            # Same file for the same video on every download
+            with open(self.media_files[zlib.crc32(video_id.encode()) % len(self.media_files)], 'rb') as media_file:
+                while chunk := media_file.read(SYNTHETIC_CHUNK_SIZE):
+                    yield chunk
+            return
+
+        # ftyp and mdat boxes, so the file is recognisably an MP4 of the advertised size
+        yield struct.pack('>I4s4sI4s4s', 24, b'ftyp', b'isom', 512, b'isom', b'mp42')
+        if self.media_size + 8 < 2 ** 32:
+            yield struct.pack('>I4s', self.media_size + 8, b'mdat')
+        else:
+            # Size 1 means the box size follows as a 64-bit largesize (header included, 16 bytes)
+            yield struct.pack('>I4sQ', 1, b'mdat', self.media_size + 16)
+        remaining = self.media_size
+        while remaining > 0:
+            chunk = self.payload_block[:remaining]
+            remaining -= len(chunk)
+            yield chunk
+
+    def download(self, url, output_path):
+        video_id = self._video_id(url)
+        if not video_id:
+            raise MediaProviderError(f'Not a synthetic video URL: {url}')
+        if not self._simulate_call('download'):
+            raise MediaProviderError(f'Injected download failure for {url}')
+
+        partial_path = f'{output_path}.part'
+        with open(partial_path, 'wb') as media_file:
+            for chunk in self._media_chunks(video_id):
+                media_file.write(chunk)
+                self._count('bytes', len(chunk))
+                if self.throughput:
+                    time.sleep(len(chunk) / self.throughput)
+        os.replace(partial_path, output_path)
+
+
+def _activate(provider):
+    global _provider
+    _provider = provider
+    set_media_provider_patterns(provider.url_patterns if provider else [])
+
+
+def media_provider():
+    """The configured provider (VIDEO_MEDIA_PROVIDER), created on first use."""
+    if _provider is None:
+        _activate(import_string(settings.VIDEO_MEDIA_PROVIDER)())
+    return _provider
+
+
+@contextmanager
+def override_media_provider(provider):
+    """Route all metadata and media requests through `provider` for the duration of the block."""
+    previous = _provider
+    _activate(provider)
+    try:
+        yield provider
+    finally:
+        _activate(previous)
+
+
+####    TESTS    ####
+
+
+def test_synthetic_urls_are_canonical_only_while_the_synthetic_provider_is_active():
+    url = 'http://synthetic.local/videos/clip?t=5'
+    assert canonicalize(url) is None
+    with override_media_provider(SyntheticProvider()):
+        assert canonicalize(url).url == 'https://synthetic.local/videos/clip'
+    assert canonicalize(url) is None
+
+
+def test_synthetic_media_over_4_gib_gets_a_64_bit_mdat_box():
+    small, large = SyntheticProvider(duration=60, bitrate_kbps=1000), SyntheticProvider(duration=3600, bitrate_kbps=10000)
+
+    assert list(small._media_chunks('clip'))[1] == struct.pack('>I4s', small.media_size + 8, b'mdat')
+    # Only the headers are generated; the payload chunks are never pulled
+    chunks = large._media_chunks('clip')
+    next(chunks)
+    assert large.media_size + 8 > 2 ** 32
+    assert next(chunks) == struct.pack('>I4sQ', 1, b'mdat', large.media_size + 16)
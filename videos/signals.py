@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from videos.models import VideoChat, VideoChatTombstone
+
+
+@receiver(post_delete, sender=VideoChat)
+def record_chat_tombstone(sender, instance, **kwargs):
+    if instance.user_id:
+        VideoChatTombstone.objects.create(user_id=instance.user_id, chat_id=instance.id)
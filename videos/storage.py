@@ -0,0 +1,157 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, InMemoryStorage, storages
+
+
+def video_storage():
+    return storages['videos']
+
+
+def _is_local(storage):
+    return isinstance(storage, FileSystemStorage)
+
+
+def _cache_path(name):
+    return os.path.join(settings.VIDEO_CACHE_ROOT, name)
+
+
+def new_media_name(user_id):
+    return f'videos/{user_id}/{uuid.uuid4().hex}.mp4'
+
+
+def new_media_path(name):
+    """
+    Local path to write a new video to before store_media(): the final location for local
+    storage, or this worker's cache for remote storage.
+    """
+    storage = video_storage()
+    path = storage.path(name) if _is_local(storage) else _cache_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def store_media(name):
+    """
+    Persist the file written to new_media_path(name). Remote backends receive it as a
+    chunked stream (multipart upload on S3) and the local copy stays in the worker cache.
+    """
+    storage = video_storage()
+    if _is_local(storage):
+        return name
+
+    with open(_cache_path(name), 'rb') as media_file:
+        stored_name = storage.save(name, File(media_file))
+    prune_media_cache()
+    return stored_name
+
+
+def local_media_path(name):
+    """
+    Local filesystem path of a stored video for stages that read the file directly.
+    Remote files are fetched into the worker cache on first access (read-through).
+    """
+    storage = video_storage()
+    if _is_local(storage):
+        return storage.path(name)
+
+    path = _cache_path(name)
+    if os.path.exists(path):
+        # Refresh the access time so pruning evicts least recently used files first
+        os.utime(path)
+        return path
+
+    # Write under a temporary name so concurrent readers never see a partial file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial_path = f'{path}.{uuid.uuid4().hex}.part'
+    with storage.open(name, 'rb') as remote_file, open(partial_path, 'wb') as local_file:
+        for chunk in remote_file.chunks(settings.VIDEO_STORAGE_CHUNK_SIZE):
+            local_file.write(chunk)
+    os.replace(partial_path, path)
+    prune_media_cache()
+    return path
+
+
+def prune_media_cache():
+    """Evict least recently used files until the worker cache fits VIDEO_CACHE_MAX_BYTES."""
+    cached_files = []
+    for directory, _, filenames in os.walk(settings.VIDEO_CACHE_ROOT):
+        for filename in filenames:
+            if not filename.endswith('.part'):
+                stat = os.stat(os.path.join(directory, filename))
+                cached_files.append((stat.st_atime, stat.st_size, os.path.join(directory, filename)))
+
+    total_size = sum(size for _, size, _ in cached_files)
+    for _, size, path in sorted(cached_files):
+        if total_size <= settings.VIDEO_CACHE_MAX_BYTES:
+            break
+        os.remove(path)
+        total_size -= size
+
+
+def _read_chunks(media_file, start, end):
+    media_file.seek(start)
+    remaining = end - start + 1
+    while remaining > 0:
+        chunk = media_file.read(min(settings.VIDEO_STORAGE_CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _readable_path(name):
+    """Local path of a stored video if this worker has it on disk, else None."""
+    storage = video_storage()
+    path = storage.path(name) if _is_local(storage) else _cache_path(name)
+    return path if os.path.exists(path) else None
+
+
+def media_size(name):
+    path = _readable_path(name)
+    return os.path.getsize(path) if path else video_storage().size(name)
+
+
+def read_range(name, start, end):
+    """
+    Yield bytes start..end (inclusive) of a stored video in VIDEO_STORAGE_CHUNK_SIZE pieces.
+    Files on disk (local storage or this worker's cache) are read directly; remote files are
+    read in place rather than fetched into the cache first, so seeking in a player only
+    transfers the requested range.
+    """
+    path = _readable_path(name)
+    if path:
+        with open(path, 'rb') as media_file:
+            yield from _read_chunks(media_file, start, end)
+        return
+
+    with video_storage().open(name, 'rb') as remote_file:
+        if hasattr(remote_file, 'obj'):
+            # S3 files download the whole object on their first read(), so ask S3 for the range itself
+            body = remote_file.obj.get(Range=f'bytes={start}-{end}')['Body']
+            yield from body.iter_chunks(settings.VIDEO_STORAGE_CHUNK_SIZE)
+        else:
+            yield from _read_chunks(remote_file, start, end)
+
+
+####    TESTS    ####
+
+
+def test_read_range_serves_remote_files_without_caching_them(settings, tmp_path, monkeypatch):
+    settings.VIDEO_CACHE_ROOT = str(tmp_path)
+    settings.VIDEO_STORAGE_CHUNK_SIZE = 4
+    storage = InMemoryStorage()
+    storage.save('videos/1/clip.mp4', ContentFile(b'0123456789'))
+    monkeypatch.setattr('videos.storage.video_storage', lambda: storage)
+
+    assert media_size('videos/1/clip.mp4') == 10
+    assert list(read_range('videos/1/clip.mp4', 3, 8)) == [b'3456', b'78']
+    assert not os.listdir(tmp_path)
+
+    # Once a stage has fetched the file into the cache, ranges are read from there
+    os.makedirs(tmp_path / 'videos' / '1')
+    (tmp_path / 'videos' / '1' / 'clip.mp4').write_bytes(b'abcdefghij')
+    assert b''.join(read_range('videos/1/clip.mp4', 7, 9)) == b'hij'
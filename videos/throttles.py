@@ -0,0 +1,103 @@
+from contextlib import ExitStack, contextmanager
+
+from rest_framework.exceptions import Throttled
+
+from django.conf import settings
+from django.core.cache import cache
+
+from users.throttles import TokenBucketThrottle
+
+GLOBAL_INGEST_KEY = 'video_ingest_inflight'
+
+
+class VideoProcessThrottle(TokenBucketThrottle):
+    scope = 'video_process'
+
+
+class VideoHistoryThrottle(TokenBucketThrottle):
+    scope = 'video_history'
+
+
+def _acquire(key, limit):
+    cache.add(key, 0, settings.VIDEO_INGEST_SLOT_TIMEOUT)
+    # Keep the counter alive while downloads keep arriving; it only expires once idle,
+    # which also clears slots leaked by a worker that died mid-download
+    cache.touch(key, settings.VIDEO_INGEST_SLOT_TIMEOUT)
+    if cache.incr(key) > limit:
+        _release(key)
+        return False
+    return True
+
+
+def _release(key):
+    if cache.get(key, 0) > 0:
+        cache.decr(key)
+
+
+@contextmanager
+def ingest_slot(user_id):
+    """
+    Admit one media download for the user or raise Throttled (429 with Retry-After).
+
+    In-flight downloads are counted in the cache per user and across all users. A user
+    already at VIDEO_INGEST_MAX_PER_USER has to wait for their own downloads, and once the
+    global backlog reaches VIDEO_INGEST_BACKLOG_LIMIT new downloads are shed for everyone.
+    """
+    user_key = f'{GLOBAL_INGEST_KEY}_{user_id}'
+
+    if not _acquire(user_key, settings.VIDEO_INGEST_MAX_PER_USER):
+        raise Throttled(
+            wait=settings.VIDEO_INGEST_RETRY_AFTER,
+            detail='You already have videos downloading. Please wait for them to finish.'
+        )
+
+    if not _acquire(GLOBAL_INGEST_KEY, settings.VIDEO_INGEST_BACKLOG_LIMIT):
+        _release(user_key)
+        raise Throttled(
+            wait=settings.VIDEO_INGEST_RETRY_AFTER,
+            detail='Video processing is at capacity. Please try again shortly.'
+        )
+
+    try:
+        yield
+    finally:
+        _release(GLOBAL_INGEST_KEY)
+        _release(user_key)
+
+
+####    TESTS    ####
+
+
+def _slot_counts(*user_ids):
+    return [cache.get(GLOBAL_INGEST_KEY)] + [cache.get(f'{GLOBAL_INGEST_KEY}_{user_id}') for user_id in user_ids]
+
+
+def test_ingest_slot_limits_each_user_and_the_global_backlog(settings):
+    import pytest
+
+    cache.clear()
+    settings.VIDEO_INGEST_MAX_PER_USER = 2
+    settings.VIDEO_INGEST_BACKLOG_LIMIT = 3
+
+    with ExitStack() as slots:
+        slots.enter_context(ingest_slot(1))
+        slots.enter_context(ingest_slot(1))
+        with pytest.raises(Throttled, match='already have videos downloading'):
+            slots.enter_context(ingest_slot(1))
+
+        slots.enter_context(ingest_slot(2))
+        with pytest.raises(Throttled, match='at capacity'):
+            slots.enter_context(ingest_slot(3))
+        assert _slot_counts(1, 2, 3) == [3, 2, 1, 0]
+
+    assert _slot_counts(1, 2, 3) == [0, 0, 0, 0]
+
+
+def test_ingest_slot_is_released_when_the_download_fails():
+    import pytest
+
+    cache.clear()
+    with pytest.raises(RuntimeError):
+        with ingest_slot(1):
+            raise RuntimeError('download failed')
+    assert _slot_counts(1) == [0, 0]
@@ -1,7 +1,11 @@
 from django.urls import path
-from videos.views import process_video, get_chat_history
+from videos.views import process_video, get_chat_history, get_chat, bulk_import_videos, import_status, video_media
 
 urlpatterns = [
     path('process/', process_video, name='process_video'),
     path('history/', get_chat_history, name='get_chat_history'),
+    path('history/<int:chat_id>/', get_chat, name='get_chat'),
+    path('import/', bulk_import_videos, name='bulk_import_videos'),
+    path('import/status/', import_status, name='import_status'),
+    path('<int:video_id>/media/', video_media, name='video_media'),
 ]
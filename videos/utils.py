@@ -1,23 +1,16 @@
-import os
-import uuid
-import yt_dlp
-from django.conf import settings
-
-
-def download_youtube_video(url, user_id):
-    """Download YouTube video and save to user-specific directory with random name."""
-    # Create user-specific directory
-    user_dir = os.path.join(settings.MEDIA_ROOT, 'videos', str(user_id))
-    os.makedirs(user_dir, exist_ok=True)
-    
-    # Generate random filename
-    random_filename = f"{uuid.uuid4().hex}.mp4"
-    output_path = os.path.join(user_dir, random_filename)
-    
-    # Configure yt-dlp options with bot detection bypass
-    ydl_opts = {
-        'outtmpl': output_path,
-        'format': 'best[ext=mp4]/best',
+def _youtube_dl(ydl_opts):
+    """
+    yt-dlp pulls in its extractor registry (about half of the web process's import time),
+    so it is imported on first use rather than with the views (see videos.warmup).
+    """
+    import yt_dlp
+
+    return yt_dlp.YoutubeDL(ydl_opts)
+
+
+def _ydl_options(**overrides):
+    """Shared yt-dlp options (browser-like headers, bot detection bypass) plus per-call overrides."""
+    return {
         'quiet': True,
         'no_warnings': True,
         # Add headers to mimic browser
@@ -40,12 +33,82 @@ def download_youtube_video(url, user_id):
         },
         'age_limit': None,  # No age restriction
         'geo_bypass': True,  # Bypass geographic restrictions
+        **overrides,
+    }
+
+
+def _video_metadata(info, url):
+    """Map a yt-dlp info dict (full or flat playlist entry) onto Video fields."""
+    thumbnails = info.get('thumbnails') or [{}]
+    return {
+        'source_url': info.get('webpage_url') or info.get('url') or url,
+        'source_provider': (info.get('extractor_key') or info.get('ie_key') or '').lower(),
+        'source_id': info.get('id') or '',
+        'title': (info.get('title') or '')[:255],
+        'duration': int(info['duration']) if info.get('duration') else None,
+        'thumbnail_url': info.get('thumbnail') or thumbnails[-1].get('url') or '',
+        'formats': [
+            {
+                'format_id': fmt.get('format_id'),
+                'ext': fmt.get('ext'),
+                'width': fmt.get('width'),
+                'height': fmt.get('height'),
+                'fps': fmt.get('fps'),
+                'vcodec': fmt.get('vcodec'),
+                'acodec': fmt.get('acodec'),
+                'filesize': fmt.get('filesize') or fmt.get('filesize_approx'),
+            }
+            for fmt in info.get('formats') or []
+        ],
     }
-    
+
+
+def extract_video_metadata(url):
+    """Fetch title, duration, formats, thumbnail and source id without downloading. None if extraction fails."""
+    with _youtube_dl(_ydl_options(ignoreerrors=True, noplaylist=True)) as ydl:
+        info = ydl.extract_info(url, download=False)
+
+    if not info:
+        return None
+    return _video_metadata(info, url)
+
+
+def extract_video_entries(url):
+    """
+    List the videos behind a video or playlist URL without downloading any media.
+
+    Playlists are resolved flat (one request for the whole list), so their entries carry
+    whatever metadata the listing provides. Returns a list of Video field dicts, or None
+    when yt-dlp cannot extract the URL.
+    """
+    ydl_opts = _ydl_options(extract_flat='in_playlist', ignoreerrors=True)
+
+    with _youtube_dl(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+
+    if not info:
+        return None
+    if info.get('_type') != 'playlist':
+        return [_video_metadata(info, url)]
+
+    # Unavailable playlist items come back as None
+    return [_video_metadata(entry, url) for entry in info['entries'] if entry]
+
+
+def download_youtube_video(url, output_path):
+    """Download YouTube video to a local path (see videos.storage.new_media_path)."""
+    # Configure yt-dlp options with bot detection bypass
+    ydl_opts = _ydl_options(
+        outtmpl=output_path,
+        format='best[ext=mp4]/best',
+    )
+
     # Download video
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    with _youtube_dl(ydl_opts) as ydl:
         ydl.download([url])
-    
-    # Return relative path from MEDIA_ROOT
-    relative_path = os.path.relpath(output_path, settings.MEDIA_ROOT)
-    return relative_path
+
+
+def preload_extractors():
+    """Import yt-dlp and build its extractor registry, as the first extraction would (videos.warmup)."""
+    with _youtube_dl(_ydl_options()):
+        pass
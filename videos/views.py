@@ -1,115 +1,431 @@
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, throttle_classes
 from rest_framework.response import Response
-from videos.models import Video, VideoChat
-from videos.utils import download_youtube_video
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import condition
+from videos.archive import CODECS, archive_chats, chat_history, rehydrate
+from videos.importer import create_videos, expand_urls, schedule_downloads, video_progress
+from videos.links import is_valid_url
+from videos.models import Video, VideoChat, VideoChatTombstone
+from videos.pipeline import answer_from_metadata, ensure_media, register_video
+from videos.providers import MediaProviderError, SyntheticProvider, override_media_provider
+from videos.storage import media_size, read_range
+from videos.throttles import VideoHistoryThrottle, VideoProcessThrottle, ingest_slot
+import datetime as dt
+import mimetypes
 import re
 
+RANGE_HEADER_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
 
 @api_view(['POST'])
+@throttle_classes([VideoProcessThrottle])
 def process_video(request):
     video_url = request.data.get('videoUrl', '')
     query = request.data.get('query', '')
     chat_id = request.data.get('chatId')
     
     # Validate URL format
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    
-    if video_url and not url_pattern.match(video_url):
+    if video_url and not is_valid_url(video_url):
         return Response({'error': 'Invalid URL format. Please provide a valid video URL.'}, status=status.HTTP_400_BAD_REQUEST)
     
     # Check if we're continuing an existing chat or starting a new one
-    if chat_id:
-        chat = VideoChat.objects.filter(id=chat_id, user=request.user).first()
-        if chat:
-            # Append to existing chat history
-            chat.chat_history.append({'query': query, 'response': None})
-            video = chat.video
-        else:
-            chat_id = None
-    
-    if not chat_id:
-        # Download video and save to user directory
-        local_video_path = download_youtube_video(video_url, request.user.id)
-        
-        # Check if video already exists for this user (by local path now)
-        video = Video.objects.filter(
-            video_path=local_video_path,
-            uploaded_by=request.user
-        ).first()
-        
+    chat = VideoChat.objects.filter(id=chat_id, user=request.user).select_related('video').first() if chat_id else None
+    if chat:
+        video = chat.video
+    else:
+        # Register the video from its metadata only; media is downloaded once a stage needs it
+        video = register_video(request.user, video_url)
         if not video:
-            # Create new video only if it doesn't exist
-            video = Video.objects.create(
-                video_path=local_video_path,
-                title=query[:255],
-                uploaded_by=request.user
-            )
-        
-        # Create new chat for this video
-        chat = VideoChat.objects.create(
-            video=video,
-            user=request.user,
-            chat_history=[{'query': query, 'response': None}]
-        )
+            return Response({'error': 'Could not read this video. Please check the URL.'}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Template response
-    response_data = {
-        'chatId': chat.id,
-        'response': f"Based on the video analysis, here's what I found regarding your query: '{query}'. The video shows relevant content that addresses your question. Key insights include understanding of the main topic, visual elements, and contextual information.",
-        'reasoning': "I analyzed the video frame by frame, extracting visual features and understanding the context. The analysis involved scene detection, object recognition, and temporal understanding to provide a comprehensive answer to your query.",
-        'keyFrames': [
-            {
-                'timestamp': '00:15',
-                'frame': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgZmlsbD0iIzMzMyIvPjx0ZXh0IHg9IjUwIiB5PSI1MCIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZmlsbD0iI2ZmZiI+RnJhbWUgMTwvdGV4dD48L3N2Zz4=',
-                'description': 'Opening scene showing the main subject'
-            },
-            {
-                'timestamp': '00:45',
-                'frame': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgZmlsbD0iIzQ0NCIvPjx0ZXh0IHg9IjUwIiB5PSI1MCIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZmlsbD0iI2ZmZiI+RnJhbWUgMjwvdGV4dD48L3N2Zz4=',
-                'description': 'Key moment demonstrating the concept'
-            },
-            {
-                'timestamp': '01:20',
-                'frame': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgZmlsbD0iIzU1NSIvPjx0ZXh0IHg9IjUwIiB5PSI1MCIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZmlsbD0iI2ZmZiI+RnJhbWUgMzwvdGV4dD48L3N2Zz4=',
-                'description': 'Conclusion and summary'
-            }
-        ],
-        'timestamps': [
-            {'time': '00:00 - 00:30', 'description': 'Introduction and context setting'},
-            {'time': '00:30 - 01:00', 'description': 'Main content and explanation'},
-            {'time': '01:00 - 01:30', 'description': 'Examples and demonstrations'},
-            {'time': '01:30 - 02:00', 'description': 'Summary and key takeaways'}
-        ]
-    }
+    metadata_answer = answer_from_metadata(video, query)
+    if metadata_answer:
+        response_data = {
+            'response': metadata_answer,
+            'reasoning': "This question is about the video's details, so I answered it from the video metadata (title, duration, formats, thumbnail) without analyzing the video itself.",
+            'keyFrames': [],
+            'timestamps': []
+        }
+    else:
+        # Frame-level analysis needs the media; downloads are admission-controlled per user and
+        # globally (429 when shed), media already downloaded is not
+        if video.status != Video.Status.READY:
+            try:
+                with ingest_slot(request.user.id):
+                    media_path = ensure_media(video)
+            except MediaProviderError:
+                return Response({'error': 'Could not download this video. Please try again later.'}, status=status.HTTP_502_BAD_GATEWAY)
+            if not media_path:
+                return Response(
+                    {'error': 'This video is still downloading. Please try again shortly.'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    headers={'Retry-After': str(settings.VIDEO_INGEST_RETRY_AFTER)}
+                )
+        
+        # Template response
+        response_data = {
+            'response': f"Based on the video analysis, here's what I found regarding your query: '{query}'. The video shows relevant content that addresses your question. Key insights include understanding of the main topic, visual elements, and contextual information.",
+            'reasoning': "I analyzed the video frame by frame, extracting visual features and understanding the context. The analysis involved scene detection, object recognition, and temporal understanding to provide a comprehensive answer to your query.",
+            'keyFrames': [
+                {
+                    'timestamp': '00:15',
+                    'frame': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgZmlsbD0iIzMzMyIvPjx0ZXh0IHg9IjUwIiB5PSI1MCIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZmlsbD0iI2ZmZiI+RnJhbWUgMTwvdGV4dD48L3N2Zz4=',
+                    'description': 'Opening scene showing the main subject'
+                },
+                {
+                    'timestamp': '00:45',
+                    'frame': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgZmlsbD0iIzQ0NCIvPjx0ZXh0IHg9IjUwIiB5PSI1MCIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZmlsbD0iI2ZmZiI+RnJhbWUgMjwvdGV4dD48L3N2Zz4=',
+                    'description': 'Key moment demonstrating the concept'
+                },
+                {
+                    'timestamp': '01:20',
+                    'frame': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwIiBoZWlnaHQ9IjEwMCIgZmlsbD0iIzU1NSIvPjx0ZXh0IHg9IjUwIiB5PSI1MCIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZmlsbD0iI2ZmZiI+RnJhbWUgMzwvdGV4dD48L3N2Zz4=',
+                    'description': 'Conclusion and summary'
+                }
+            ],
+            'timestamps': [
+                {'time': '00:00 - 00:30', 'description': 'Introduction and context setting'},
+                {'time': '00:30 - 01:00', 'description': 'Main content and explanation'},
+                {'time': '01:00 - 01:30', 'description': 'Examples and demonstrations'},
+                {'time': '01:30 - 02:00', 'description': 'Summary and key takeaways'}
+            ]
+        }
     
-    # Update chat history with response
-    chat.chat_history[-1]['response'] = response_data
-    chat.save()
+    # The chat is only written once there is an answer, so shed or failed requests leave nothing behind
+    if chat:
+        # Archived chats move back into the hot table before they are appended to
+        rehydrate(chat)
+        chat.chat_history.append({'query': query, 'response': response_data})
+        chat.save()
+    else:
+        chat = VideoChat.objects.create(video=video, user=request.user, chat_history=[{'query': query, 'response': response_data}])
     
-    return Response(response_data, status=status.HTTP_200_OK)
+    return Response({'chatId': chat.id, **response_data}, status=status.HTTP_200_OK)
+
+
+def chat_history_etag(request):
+    # Any new message bumps updated_at and any deleted chat changes the count; archiving keeps
+    # updated_at but changes the listed chat (isArchived, no chat_history), so archived chats are counted
+    stats = VideoChat.objects.filter(user=request.user).aggregate(
+        last_updated=Max('updated_at'),
+        total=Count('id'),
+        archived=Count('id', filter=Q(is_archived=True))
+    )
+    last_updated = stats['last_updated'].timestamp() if stats['last_updated'] else 0
+    return f"{request.user.pk}-{stats['total']}-{stats['archived']}-{last_updated}-{request.GET.get('since', '')}"
+
+
+def _parse_since(value):
+    # parse_datetime returns None for malformed values but raises for impossible dates (Feb 30)
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        return None
+
+
+def _chat_summary(chat, messages):
+    return {
+        'id': chat.id,
+        'videoUrl': chat.video.source_url or chat.video.video_path,
+        'videoTitle': chat.video.title,
+        'lastMessage': chat.last_message,
+        'updatedAt': chat.updated_at.isoformat(),
+        'messageCount': chat.message_count,
+        'isArchived': chat.is_archived,
+        'chat_history': messages  # Full chat history for loading; None for archived chats
+    }
 
 
 @api_view(['GET'])
+@throttle_classes([VideoHistoryThrottle])
+@condition(etag_func=chat_history_etag)
 def get_chat_history(request):
+    # updated_at is stamped by auto_now on the worker that saves a chat, before it commits, so a
+    # chat can become visible after this read with an updated_at earlier than now. The token is
+    # set CHAT_SYNC_TOKEN_MARGIN seconds back (which also absorbs clock skew between nodes) so
+    # such chats are sent again on the next sync instead of being skipped; clients merge by id.
+    sync_token = timezone.now() - dt.timedelta(seconds=settings.CHAT_SYNC_TOKEN_MARGIN)
     chats = VideoChat.objects.filter(user=request.user).select_related('video')
+    deleted = []
+
+    # Delta sync: only chats changed (and tombstones recorded) after the client's last syncToken
+    since = request.query_params.get('since')
+    if since:
+        since = _parse_since(since)
+        if not since:
+            return Response({'error': 'Invalid since timestamp. Use the syncToken from a previous response.'}, status=status.HTTP_400_BAD_REQUEST)
+        chats = chats.filter(updated_at__gt=since)
+        deleted = list(VideoChatTombstone.objects.filter(
+            user=request.user,
+            deleted_at__gt=since
+        ).values_list('chat_id', flat=True))
     
-    history = []
-    for chat in chats:
-        history.append({
-            'id': chat.id,
-            'videoUrl': chat.video.video_path,
-            'videoTitle': chat.video.title,
-            'lastMessage': chat.chat_history[-1]['query'] if chat.chat_history else '',
-            'updatedAt': chat.updated_at.isoformat(),
-            'messageCount': len(chat.chat_history),
-            'chat_history': chat.chat_history  # Include full chat history for loading
-        })
+    # Archived chats are listed from their stub row; clients fetch their messages from
+    # get_chat when opened, so listing never decompresses archives
+    history = [_chat_summary(chat, None if chat.is_archived else chat.chat_history) for chat in chats]
     
-    return Response({'chats': history}, status=status.HTTP_200_OK)
\ No newline at end of file
+    return Response({'chats': history, 'deleted': deleted, 'syncToken': sync_token.isoformat()}, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@throttle_classes([VideoHistoryThrottle])
+def get_chat(request, chat_id):
+    chat = VideoChat.objects.filter(id=chat_id, user=request.user).select_related('video', 'archive').first()
+    if not chat:
+        return Response({'error': 'Chat not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    # Archived chats are decompressed for the response but stay archived until continued
+    return Response(_chat_summary(chat, chat_history(chat)), status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@throttle_classes([VideoProcessThrottle])
+def bulk_import_videos(request):
+    urls = request.data.get('urls') or []
+    if request.data.get('playlistUrl'):
+        urls = [request.data['playlistUrl']]
+
+    if not urls or not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+        return Response({'error': 'Provide a list of video URLs or a playlist URL.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Every URL is extracted before the response is sent, so the request takes only a few
+    if len(urls) > settings.VIDEO_IMPORT_MAX_REQUEST_URLS:
+        return Response(
+            {'error': f'Import at most {settings.VIDEO_IMPORT_MAX_REQUEST_URLS} URLs per request ({len(urls)} given). Import larger lists with "manage.py import_videos".'},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+
+    invalid_urls = [url for url in urls if not is_valid_url(url)]
+    if invalid_urls:
+        return Response({'error': 'Invalid URL format.', 'invalidUrls': invalid_urls}, status=status.HTTP_400_BAD_REQUEST)
+
+    entries, failed_urls = expand_urls(urls)
+    if len(entries) > settings.VIDEO_IMPORT_MAX_ITEMS:
+        return Response(
+            {'error': f'An import can contain at most {settings.VIDEO_IMPORT_MAX_ITEMS} videos ({len(entries)} found).'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Downloads continue in the background; poll import_status for per-video progress
+    videos = create_videos(request.user, entries)
+    schedule_downloads(videos)
+
+    return Response({
+        'videos': [video_progress(video) for video in videos],
+        'skipped': len(entries) - len(videos),
+        'failedUrls': failed_urls
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@throttle_classes([VideoHistoryThrottle])
+def import_status(request):
+    ids = [video_id for video_id in request.query_params.get('ids', '').split(',') if video_id.isdigit()]
+    videos = Video.objects.filter(uploaded_by=request.user, id__in=ids)
+
+    return Response({'videos': [video_progress(video) for video in videos]}, status=status.HTTP_200_OK)
+
+
+def _byte_range(header, size):
+    """
+    (start, end, partial) for a single byte range (bytes=start-end, bytes=start- or bytes=-suffix)
+    so players can seek, or None when the range cannot be satisfied. Anything else, including
+    "bytes=-" and multiple ranges, gets the whole file.
+    """
+    range_match = RANGE_HEADER_PATTERN.match(header)
+    if not range_match or not any(range_match.groups()):
+        return 0, size - 1, False
+
+    first, last = range_match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    return (start, end, True) if start <= end else None
+
+
+@api_view(['GET'])
+def video_media(request, video_id):
+    video = Video.objects.filter(id=video_id, uploaded_by=request.user, status=Video.Status.READY).first()
+    if not video:
+        return Response({'error': 'Video not found or not downloaded yet'}, status=status.HTTP_404_NOT_FOUND)
+
+    size = media_size(video.video_path)
+    byte_range = _byte_range(request.headers.get('Range', ''), size)
+    if not byte_range:
+        return HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers={'Content-Range': f'bytes */{size}'})
+    start, end, partial = byte_range
+
+    response = StreamingHttpResponse(
+        read_range(video.video_path, start, end),
+        status=status.HTTP_206_PARTIAL_CONTENT if partial else status.HTTP_200_OK,
+        content_type=mimetypes.guess_type(video.video_path)[0] or 'application/octet-stream'
+    )
+    response.headers['Accept-Ranges'] = 'bytes'
+    response.headers['Content-Length'] = str(end - start + 1)
+    if partial:
+        response.headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+####    TESTS    ####
+
+
+def _login(client, django_user_model, email='viewer@example.com'):
+    cache.clear()
+    user = django_user_model.objects.create_user(email=email, password='password')
+    client.force_login(user)
+    return user
+
+
+def _history(client, since=None):
+    return client.get('/api/videos/history/', {'since': since} if since else {})
+
+
+def test_history_rejects_malformed_and_impossible_since(client, django_user_model):
+    _login(client, django_user_model)
+
+    assert _history(client, 'yesterday').status_code == 400
+    assert _history(client, '2026-02-30T00:00:00').status_code == 400
+
+
+def test_history_delta_sync_resends_chats_committed_after_the_token(client, django_user_model):
+    user = _login(client, django_user_model)
+    video = Video.objects.create(uploaded_by=user, source_url='https://example.com/a.mp4')
+    deleted_chat_id = VideoChat.objects.create(video=video, user=user).id
+    token = _history(client).json()['syncToken']
+
+    # Stamped just before the token was handed out, but only committed afterwards
+    late_chat = VideoChat.objects.create(video=video, user=user)
+    VideoChat.objects.filter(id=late_chat.id).update(updated_at=timezone.now() - dt.timedelta(seconds=1))
+    VideoChat.objects.get(id=deleted_chat_id).delete()
+
+    delta = _history(client, token).json()
+    assert [chat['id'] for chat in delta['chats']] == [late_chat.id]
+    assert delta['deleted'] == [deleted_chat_id]
+
+
+def test_history_etag_revalidates_compressed_responses_and_changes_on_delete(client, django_user_model):
+    user = _login(client, django_user_model)
+    video = Video.objects.create(uploaded_by=user, source_url='https://example.com/a.mp4')
+    message = {'query': 'What happens?', 'response': {'response': 'Something happens. ' * 100}}
+    chats = [VideoChat.objects.create(video=video, user=user, chat_history=[message]) for _ in range(2)]
+
+    response = client.get('/api/videos/history/', HTTP_ACCEPT_ENCODING='br')
+    etag = response['ETag']
+    assert response['Content-Encoding'] == 'br'
+    assert etag.startswith('W/"')
+
+    revalidated = client.get('/api/videos/history/', HTTP_ACCEPT_ENCODING='br', HTTP_IF_NONE_MATCH=etag)
+    assert revalidated.status_code == 304
+
+    chats[0].delete()
+    response = client.get('/api/videos/history/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag.removeprefix('W/')
+    assert [chat['id'] for chat in response.json()['chats']] == [chats[1].id]
+
+
+def test_bulk_import_rejects_malformed_and_oversized_url_lists(client, django_user_model, settings, monkeypatch):
+    _login(client, django_user_model)
+    settings.VIDEO_IMPORT_MAX_REQUEST_URLS = 2
+
+    def expand_urls(urls):
+        raise AssertionError('URLs were expanded before being validated')
+    monkeypatch.setattr('videos.views.expand_urls', expand_urls)
+
+    def import_urls(payload):
+        return client.post('/api/videos/import/', payload, content_type='application/json')
+
+    for payload in [{'urls': 'https://youtu.be/abcdefghijk'}, {'urls': ['https://youtu.be/abcdefghijk', 1]}, {'playlistUrl': 7}]:
+        assert import_urls(payload).status_code == 400
+
+    response = import_urls({'urls': [f'https://youtu.be/abcdefghij{index}' for index in range(3)]})
+    assert response.status_code == 413
+    assert '(3 given)' in response.json()['error']
+
+
+def _ask(client, query, video_url='https://synthetic.local/videos/clip', chat_id=None):
+    return client.post('/api/videos/process/', {'videoUrl': video_url, 'query': query, 'chatId': chat_id}, content_type='application/json')
+
+
+def test_process_video_failed_download_returns_502_without_a_chat(client, django_user_model, monkeypatch, tmp_path):
+    _login(client, django_user_model)
+    provider = SyntheticProvider()
+
+    def download(url, output_path):
+        # A second question about the same video arrives while it is downloading
+        concurrent.append(_ask(client, 'What does the chef say at the end?').status_code)
+        raise MediaProviderError('Connection reset by peer')
+    concurrent = []
+    monkeypatch.setattr(provider, 'download', download)
+    monkeypatch.setattr('videos.pipeline.new_media_path', lambda name: str(tmp_path / 'video.mp4'))
+
+    with override_media_provider(provider):
+        assert _ask(client, 'What is the video called?').status_code == 200
+        assert _ask(client, 'How long does the chef bake the cake?').status_code == 502
+    assert concurrent == [503]
+
+    video = Video.objects.get()
+    assert (video.status, video.download_error) == (Video.Status.FAILED, 'Connection reset by peer')
+    # Only the question answered from metadata has a chat, and no ingest slot leaked
+    assert [chat['chat_history'][-1]['query'] for chat in VideoChat.objects.values('chat_history')] == ['What is the video called?']
+    assert cache.get('video_ingest_inflight') == 0
+
+
+def test_process_video_sheds_downloads_but_not_downloaded_videos(client, django_user_model, settings):
+    user = _login(client, django_user_model)
+    settings.VIDEO_INGEST_MAX_PER_USER = 0
+
+    with override_media_provider(SyntheticProvider()):
+        assert _ask(client, 'Explain what happens in this video.').status_code == 429
+    assert not VideoChat.objects.exists()
+
+    video = Video.objects.create(uploaded_by=user, video_path='videos/clip.mp4', title='Clip', duration=75)
+    chat = VideoChat.objects.create(video=video, user=user, chat_history=[])
+    response = _ask(client, 'How long does the chef bake the cake?', chat_id=chat.id)
+    assert response.status_code == 200
+    chat.refresh_from_db()
+    assert [message['query'] for message in chat.chat_history] == ['How long does the chef bake the cake?']
+
+
+def test_byte_range_parsing():
+    assert _byte_range('', 100) == (0, 99, False)
+    assert _byte_range('bytes=-', 100) == (0, 99, False)
+    assert _byte_range('bytes=0-9,20-29', 100) == (0, 99, False)
+    assert _byte_range('bytes=10-19', 100) == (10, 19, True)
+    assert _byte_range('bytes=90-', 100) == (90, 99, True)
+    assert _byte_range('bytes=90-500', 100) == (90, 99, True)
+    assert _byte_range('bytes=-30', 100) == (70, 99, True)
+    assert _byte_range('bytes=-500', 100) == (0, 99, True)
+    assert _byte_range('bytes=100-', 100) is None
+    assert _byte_range('bytes=20-10', 100) is None
+    assert _byte_range('bytes=-0', 100) is None
+
+
+def test_history_lists_archived_chats_without_decompressing_them(client, django_user_model, monkeypatch):
+    user = _login(client, django_user_model)
+    chat = VideoChat.objects.create(video=Video.objects.create(uploaded_by=user), user=user, chat_history=[{'query': 'What happens?', 'response': None}])
+    VideoChat.objects.filter(id=chat.id).update(updated_at=timezone.now() - dt.timedelta(days=settings.CHAT_ARCHIVE_AFTER_DAYS + 1))
+    etag = _history(client)['ETag']
+    assert sum(archive_chats()) == 1
+    # Archiving keeps updated_at, but the listed chat changes, so cached lists must not revalidate
+    assert client.get('/api/videos/history/', HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    decompressed = []
+    for codec, (compress, decompress) in list(CODECS.items()):
+        monkeypatch.setitem(CODECS, codec, (compress, lambda payload, decompress=decompress: decompressed.append(1) or decompress(payload)))
+
+    [listed] = _history(client).json()['chats']
+    assert (listed['lastMessage'], listed['messageCount'], listed['isArchived'], listed['chat_history']) == ('What happens?', 1, True, None)
+    assert not decompressed
+
+    opened = client.get(f'/api/videos/history/{chat.id}/').json()
+    assert opened['chat_history'] == [{'query': 'What happens?', 'response': None}]
+    assert len(decompressed) == 1
+    assert VideoChat.objects.get(id=chat.id).is_archived